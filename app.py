@@ -11,57 +11,19 @@ st.set_page_config(
 import os
 import time
 import logging
-import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from streamlit_folium import folium_static
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from utils.earth_engine import initialize_earth_engine, get_earth_engine_map
-from utils.data_processor import load_climate_data, generate_historical_temperature_data
-from utils.visualization import create_climate_risk_map
+from utils.data_processor import generate_historical_temperature_data
 from database.connection import init_db, check_connection
+from utils.logging_setup import configure_logging
 
-# Import new modules
-from utils.climate_data.climate_data_source import ClimateDataSource
-from utils.climate_data.heatmap_generator import GlobalHeatmapGenerator
-from utils.ai_storytelling.storyteller import ClimateStoryteller
-from utils.gamification.climate_game import ClimateGame
-from utils.quantum_prediction import QuantumClimatePredictor
-from utils.climate_interventions import ClimateInterventionSimulator
+# Feature modules (data sources, quantum, interventions, storytelling, game,
+# heatmaps) are imported by their own pages, not by the landing page
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-# Initialize session state for user preferences
-if 'dark_mode' not in st.session_state:
-    st.session_state.dark_mode = False
-    
-if 'viewed_features' not in st.session_state:
-    st.session_state.viewed_features = []
-    
-if 'last_refresh' not in st.session_state:
-    st.session_state.last_refresh = datetime.now()
-    
-if 'db_initialized' not in st.session_state:
-    st.session_state.db_initialized = False
-
-# Initialize Earth Engine
-ee_initialized = initialize_earth_engine()
-
-# Check database connection status
-db_connected = check_connection()
-if db_connected:
-    st.session_state.db_initialized = True
-    logger.info("Database connection successful")
-else:
-    st.session_state.db_initialized = False
-    logger.error("Database connection failed")
-
-# CSS for enhanced UI
-st.markdown("""
+# Static page styles, built once per process
+_STATIC_CSS = """
 <style>
     /* Modern theme customization */
     .main {
@@ -233,7 +195,62 @@ st.markdown("""
         border: 1px solid rgba(255, 99, 132, 0.5);
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Set up logging
+configure_logging()
+logger = logging.getLogger(__name__)
+
+# Initialize session state for user preferences
+for key, default in (
+    ("dark_mode", False),
+    ("viewed_features", []),
+    ("last_refresh", datetime.now()),
+    ("db_initialized", False),
+    ("show_map", False),
+):
+    st.session_state.setdefault(key, default)
+
+# Cache connection handshakes so they persist across reruns and sessions
+@st.cache_resource
+def _ee():
+    return initialize_earth_engine()
+
+@st.cache_resource(ttl=60)
+def _bootstrap_db():
+    # Revalidate the connection at most once a minute; init_db only creates
+    # tables on the first successful call per process
+    if not check_connection():
+        logger.error("Database connection failed")
+        return False
+    if not init_db():
+        logger.error("Failed to initialize database")
+        return False
+    logger.info("Database initialized successfully")
+    return True
+
+# Reuse the Folium map object instead of rebuilding it on every interaction
+@st.cache_resource(show_spinner=False)
+def _cached_ee_map(lat, lon, zoom):
+    return get_earth_engine_map(center_lat=lat, center_lon=lon, zoom=zoom)
+
+# Cache the fallback temperature chart so reruns skip figure layout
+@st.cache_data
+def _build_temp_fig(df, y_column):
+    import plotly.express as px
+    fig = px.line(df, x="year", y=y_column, 
+                  title="Global Temperature Anomaly (°C) - 1880-Present")
+    fig.update_layout(height=400, width=1200)
+    return fig
+
+# Initialize Earth Engine
+ee_initialized = _ee()
+
+# Initialize the database
+st.session_state.db_initialized = _bootstrap_db()
+
+# CSS for enhanced UI
+st.html(_STATIC_CSS)
 
 # Apply dark mode if enabled
 if st.session_state.dark_mode:
@@ -243,6 +260,48 @@ if st.session_state.dark_mode:
     </script>
     """, unsafe_allow_html=True)
 
+# Interactive sidebar widgets run as fragments so a click only reruns the fragment
+@st.fragment
+def _sidebar_prefs():
+    # Use checkbox instead of toggle
+    dark_mode = st.checkbox("Dark Mode", value=st.session_state.dark_mode)
+    
+    # Dark mode restyles the whole page, so it still needs a full rerun
+    if dark_mode != st.session_state.dark_mode:
+        st.session_state.dark_mode = dark_mode
+        st.rerun()
+    
+    if st.session_state.dark_mode:
+        st.write("🌙 Dark Mode is enabled!")
+    else:
+        st.write("☀️ Light Mode is enabled!")
+    
+    high_resolution = st.checkbox("High Resolution Maps", value=True)
+    realtime_data = st.checkbox("Real-time Data Updates", value=True)
+
+@st.fragment
+def _refresh_panel():
+    st.subheader("🔄 Last Updated")
+    if st.button("Refresh Data"):
+        with st.spinner("Refreshing global climate data..."):
+            time.sleep(1)  # Simulate data refresh
+            st.session_state.last_refresh = datetime.now()
+    st.text(f"{st.session_state.last_refresh.strftime('%H:%M:%S')}")
+
+@st.fragment
+def _layer_controls():
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        st.multiselect("Data Layers", 
+                      ["Temperature", "Precipitation", "Vegetation", "Sea Ice", "Emissions"], 
+                      default=["Temperature", "Precipitation"])
+    with col2:
+        st.select_slider("Time Period", 
+                         options=["Past 24h", "Past Week", "Past Month", "Past Year", "Past Decade"],
+                         value="Past Month")
+    with col3:
+        st.button("Full Screen View", key="fullscreen")
+
 # Sidebar customization
 with st.sidebar:
     # Use a more reliable emoji instead of the external image that's failing to load
@@ -255,28 +314,7 @@ with st.sidebar:
     
     # User preferences section
     st.subheader("🔧 Preferences")
-    # Set default session state if not already set
-if "dark_mode" not in st.session_state:
-    st.session_state.dark_mode = False
-
-# Use checkbox instead of toggle
-dark_mode = st.checkbox("Dark Mode", value=st.session_state.dark_mode)
-
-# Update session state
-st.session_state.dark_mode = dark_mode
-
-# Example usage
-if st.session_state.dark_mode:
-    st.write("🌙 Dark Mode is enabled!")
-else:
-    st.write("☀️ Light Mode is enabled!")
-    if dark_mode != st.session_state.dark_mode:
-        st.session_state.dark_mode = dark_mode
-        st.rerun()
-    
-    high_resolution = st.checkbox("High Resolution Maps", value=True)
-    realtime_data = st.checkbox("Real-time Data Updates", value=True)
-
+    _sidebar_prefs()
     
     # Google Cloud Integration Status
     st.divider()
@@ -296,13 +334,10 @@ else:
     st.divider()
     st.subheader("💾 Database Status")
     db_status = st.empty()
-    if 'db_initialized' in st.session_state:
-        if st.session_state.db_initialized:
-            db_status.success("Database Connected")
-        else:
-            db_status.error("Database Connection Failed")
+    if st.session_state.db_initialized:
+        db_status.success("Database Connected")
     else:
-        db_status.info("Initializing Database...")
+        db_status.error("Database Connection Failed")
     
     # Additional sidebar sections
     st.divider()
@@ -314,50 +349,20 @@ else:
     )
     
     st.divider()
-    st.subheader("🔄 Last Updated")
-    st.text(f"{st.session_state.last_refresh.strftime('%H:%M:%S')}")
-    if st.button("Refresh Data"):
-        with st.spinner("Refreshing global climate data..."):
-            time.sleep(1)  # Simulate data refresh
-            st.session_state.last_refresh = datetime.now()
-            st.experimental_rerun()
+    _refresh_panel()
 
 # Main content area
 # Modern header with animation
-st.markdown("""
+st.html("""
 <div class="header-container">
     <div>
         <h1 class="logo-text">GAIA-∞</h1>
         <h3 class="quantum-title">Quantum-Enhanced Climate Intelligence Platform</h3>
     </div>
 </div>
-""", unsafe_allow_html=True)
-
-# Interactive welcome message with typewriter effect
-st.markdown("""
-<div id="welcome-message" style="min-height: 60px; margin-bottom: 20px;">
-    <script>
-        const text = "GAIA-∞ is a billion-dollar climate intelligence platform that visualizes and simulates Earth systems using Google's advanced geospatial and quantum AI tools. This platform provides real-time insights into climate patterns, predicts environmental events with unprecedented accuracy, and supports data-driven decision making for global climate action.";
-        let i = 0;
-        const speed = 30; // typing speed in milliseconds
-        
-        function typeWriter() {
-            if (i < text.length) {
-                document.getElementById("welcome-text").innerHTML += text.charAt(i);
-                i++;
-                setTimeout(typeWriter, speed);
-            }
-        }
-        
-        document.addEventListener("DOMContentLoaded", function() {
-            setTimeout(typeWriter, 500);
-        });
-    </script>
-    <p id="welcome-text" style="font-size: 1.1rem; line-height: 1.6;"></p>
-</div>
-""", unsafe_allow_html=True)
+""")
 
-# Fixed text (for when JavaScript doesn't load)
+# Welcome message
 st.markdown("""
 GAIA-∞ is a billion-dollar climate intelligence platform that visualizes and simulates Earth systems 
 using Google's advanced geospatial and quantum AI tools. This platform provides real-time insights into climate 
@@ -367,13 +372,10 @@ patterns, predicts environmental events with unprecedented accuracy, and support
 # Dashboard Layout with animated Key Metrics
 st.markdown("<h2>Global Climate Overview</h2>", unsafe_allow_html=True)
 
-# Create columns for metrics with enhanced styling
-metric_cols = st.columns(4)
-
 # Function to create animated metrics
-def animated_metric(label, value, delta, col, icon, color="#00a3e0"):
-    with col:
-        st.markdown(f"""
+def animated_metric(label, value, delta_value, delta_str, icon, color="#00a3e0"):
+    delta_color = "red" if delta_value > 0 else "green"
+    return f"""
         <div class="metric-container" style="border-left: 4px solid {color};">
             <div style="display: flex; align-items: center; margin-bottom: 10px;">
                 <div style="font-size: 1.5rem; margin-right: 10px; color: {color};">{icon}</div>
@@ -381,16 +383,23 @@ def animated_metric(label, value, delta, col, icon, color="#00a3e0"):
             </div>
             <div style="display: flex; justify-content: space-between; align-items: baseline;">
                 <div style="font-size: 1.8rem; font-weight: 700;">{value}</div>
-                <div style="color: {'red' if float(delta.replace('°C', '').replace('+', '').replace(' ppm', '').replace(' mm/yr', '').replace('%', '').replace(' change', '').replace(' per decade', '')) > 0 else 'green'}; font-weight: 600;">{delta}</div>
+                <div style="color: {delta_color}; font-weight: 600;">{delta_str}</div>
             </div>
         </div>
-        """, unsafe_allow_html=True)
-
-# Apply animated metrics
-animated_metric("Global Temperature", "+1.1°C", "+0.2°C", metric_cols[0], "🌡️", "#FF5733")
-animated_metric("CO₂ Concentration", "417 ppm", "+2.5 ppm", metric_cols[1], "💨", "#4CAF50")
-animated_metric("Sea Level Rise", "+3.4 mm/yr", "+0.1 mm/yr", metric_cols[2], "🌊", "#2196F3")
-animated_metric("Arctic Sea Ice", "-13.1%", "-0.4% change", metric_cols[3], "❄️", "#9C27B0")
+        """
+
+# Apply animated metrics as a single four-column grid
+metric_specs = [
+    ("Global Temperature", "+1.1°C", 0.2, "+0.2°C", "🌡️", "#FF5733"),
+    ("CO₂ Concentration", "417 ppm", 2.5, "+2.5 ppm", "💨", "#4CAF50"),
+    ("Sea Level Rise", "+3.4 mm/yr", 0.1, "+0.1 mm/yr", "🌊", "#2196F3"),
+    ("Arctic Sea Ice", "-13.1%", -0.4, "-0.4% change", "❄️", "#9C27B0"),
+]
+st.html(
+    "<div class='metric-row' style='display: grid; grid-template-columns: repeat(4, 1fr); gap: 10px;'>"
+    + "".join(animated_metric(*spec) for spec in metric_specs)
+    + "</div>"
+)
 
 # Global Alert System
 st.markdown("<div class='alert-box'><strong>⚠️ ALERT:</strong> Extreme heat event detected in Southeast Asia. Predicted to affect 20M+ people over the next 5 days.</div>", unsafe_allow_html=True)
@@ -407,8 +416,14 @@ with map_container:
     with st.spinner("Loading Earth Digital Twin..."):
         # Load map data
         if ee_initialized:
-            m = get_earth_engine_map(center_lat=20, center_lon=0, zoom=2)
-            folium_static(m, width=1250, height=500)
+            # Defer the Folium map until the user asks for it
+            if not st.session_state.show_map:
+                st.button("Load Earth Digital Twin", key="load_map",
+                          on_click=lambda: st.session_state.update(show_map=True))
+            else:
+                from streamlit_folium import folium_static
+                m = _cached_ee_map(20, 0, 2)
+                folium_static(m, width=1250, height=500)
         else:
             # Fallback visualization when Earth Engine isn't initialized
             st.markdown('<div style="text-align: center; font-size: 8rem;">🌍</div>', unsafe_allow_html=True)
@@ -428,193 +443,134 @@ with map_container:
                 df = pd.DataFrame({"year": years, "anomaly": anomalies})
                 y_column = 'anomaly'
                 
-            fig = px.line(df, x="year", y=y_column, 
-                          title="Global Temperature Anomaly (°C) - 1880-Present")
-            fig.update_layout(height=400, width=1200)
+            fig = _build_temp_fig(df, y_column)
             st.plotly_chart(fig, use_container_width=True)
     
     # Layer controls
-    col1, col2, col3 = st.columns([2, 2, 1])
-    with col1:
-        st.multiselect("Data Layers", 
-                      ["Temperature", "Precipitation", "Vegetation", "Sea Ice", "Emissions"], 
-                      default=["Temperature", "Precipitation"])
-    with col2:
-        st.select_slider("Time Period", 
-                         options=["Past 24h", "Past Week", "Past Month", "Past Year", "Past Decade"],
-                         value="Past Month")
-    with col3:
-        st.button("Full Screen View", key="fullscreen")
+    _layer_controls()
     
     st.markdown("</div>", unsafe_allow_html=True)
 
 # Interactive feature cards using custom CSS
 st.markdown("<h2>Explore GAIA-∞ Features</h2>", unsafe_allow_html=True)
 
-feature_col1, feature_col2 = st.columns(2)
-
-# Initialize data source for stats
-climate_data_source = ClimateDataSource()
+# Feature card content: (icon, title, description, ((badge color, label), ...), progress %)
+FEATURES = (
+    ("🌎", "Earth Digital Twin",
+     "Explore our interactive digital twin of Earth with real-time data from multiple satellite sources, powered by Google Earth Engine.",
+     (("blue", "Real-time"), ("green", "3D Visualization")), 85),
+    ("📊", "Climate Dashboard",
+     "View comprehensive climate metrics with advanced analytics and predictive insights using Google Cloud AI.",
+     (("blue", "AI-Powered"), ("green", "Real-time Data")), 95),
+    ("🔮", "Quantum Climate Simulations",
+     "Run advanced climate change scenarios using quantum-enhanced computational models for unprecedented accuracy.",
+     (("blue", "Quantum-Powered"), ("red", "Beta")), 75),
+    ("🚨", "Environmental Alerts",
+     "Monitor and predict critical environmental events with AI-enhanced early warning systems.",
+     (("blue", "AI Predictions"), ("green", "Global Coverage")), 90),
+)
 
-with feature_col1:
-    st.markdown("""
-    <div class="feature-card">
-        <h3 style="display: flex; align-items: center;"><span style="font-size: 1.5rem; margin-right: 10px;">🌎</span> Earth Digital Twin</h3>
-        <p>Explore our interactive digital twin of Earth with real-time data from multiple satellite sources, powered by Google Earth Engine.</p>
-        <div style="display: flex; margin-top: 10px;">
-            <span class="badge badge-blue">Real-time</span>
-            <span class="badge badge-green">3D Visualization</span>
-        </div>
-        <div class="progress-bar-container">
-            <div class="progress-bar" style="width: 85%;"></div>
-        </div>
-    </div>
-    
+@st.cache_data
+def _card_html(spec):
+    icon, title, description, badges, progress = spec
+    badge_html = "".join(
+        f'<span class="badge badge-{color}">{label}</span>' for color, label in badges
+    )
+    return f"""
     <div class="feature-card">
-        <h3 style="display: flex; align-items: center;"><span style="font-size: 1.5rem; margin-right: 10px;">📊</span> Climate Dashboard</h3>
-        <p>View comprehensive climate metrics with advanced analytics and predictive insights using Google Cloud AI.</p>
+        <h3 style="display: flex; align-items: center;"><span style="font-size: 1.5rem; margin-right: 10px;">{icon}</span> {title}</h3>
+        <p>{description}</p>
         <div style="display: flex; margin-top: 10px;">
-            <span class="badge badge-blue">AI-Powered</span>
-            <span class="badge badge-green">Real-time Data</span>
+            {badge_html}
         </div>
         <div class="progress-bar-container">
-            <div class="progress-bar" style="width: 95%;"></div>
+            <div class="progress-bar" style="width: {progress}%;"></div>
         </div>
     </div>
-    """, unsafe_allow_html=True)
+    """
 
-with feature_col2:
-    st.markdown("""
-    <div class="feature-card">
-        <h3 style="display: flex; align-items: center;"><span style="font-size: 1.5rem; margin-right: 10px;">🔮</span> Quantum Climate Simulations</h3>
-        <p>Run advanced climate change scenarios using quantum-enhanced computational models for unprecedented accuracy.</p>
-        <div style="display: flex; margin-top: 10px;">
-            <span class="badge badge-blue">Quantum-Powered</span>
-            <span class="badge badge-red">Beta</span>
-        </div>
-        <div class="progress-bar-container">
-            <div class="progress-bar" style="width: 75%;"></div>
-        </div>
-    </div>
-    
-    <div class="feature-card">
-        <h3 style="display: flex; align-items: center;"><span style="font-size: 1.5rem; margin-right: 10px;">🚨</span> Environmental Alerts</h3>
-        <p>Monitor and predict critical environmental events with AI-enhanced early warning systems.</p>
-        <div style="display: flex; margin-top: 10px;">
-            <span class="badge badge-blue">AI Predictions</span>
-            <span class="badge badge-green">Global Coverage</span>
-        </div>
-        <div class="progress-bar-container">
-            <div class="progress-bar" style="width: 90%;"></div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+feature_cols = st.columns(2)
+for i, feature_col in enumerate(feature_cols):
+    with feature_col:
+        st.html("".join(_card_html(spec) for spec in FEATURES[2 * i:2 * i + 2]))
 
 # Quick facts with animated counters
 st.markdown("<h2>GAIA-∞ Impact</h2>", unsafe_allow_html=True)
 
-impact_cols = st.columns(4)
-
-with impact_cols[0]:
-    st.markdown("""
-    <div class="metric-container" style="text-align: center;">
-        <div style="font-size: 2.5rem; font-weight: 700; color: #00a3e0;" id="counter1">250+</div>
-        <div>Data sources integrated</div>
-    </div>
-    """, unsafe_allow_html=True)
-
-with impact_cols[1]:
-    st.markdown("""
+impact_stats = [
+    ("counter1", "250+", "Data sources integrated"),
+    ("counter2", "15PB", "Data processed daily"),
+    ("counter3", "99.9%", "Prediction accuracy"),
+    ("counter4", "128", "Quantum qubits leveraged"),
+]
+st.html(
+    "<div style='display: grid; grid-template-columns: repeat(4, 1fr); gap: 10px;'>"
+    + "".join(f"""
     <div class="metric-container" style="text-align: center;">
-        <div style="font-size: 2.5rem; font-weight: 700; color: #00a3e0;" id="counter2">15PB</div>
-        <div>Data processed daily</div>
+        <div style="font-size: 2.5rem; font-weight: 700; color: #00a3e0;" id="{counter_id}">{value}</div>
+        <div>{caption}</div>
     </div>
-    """, unsafe_allow_html=True)
-
-with impact_cols[2]:
-    st.markdown("""
-    <div class="metric-container" style="text-align: center;">
-        <div style="font-size: 2.5rem; font-weight: 700; color: #00a3e0;" id="counter3">99.9%</div>
-        <div>Prediction accuracy</div>
-    </div>
-    """, unsafe_allow_html=True)
-
-with impact_cols[3]:
-    st.markdown("""
-    <div class="metric-container" style="text-align: center;">
-        <div style="font-size: 2.5rem; font-weight: 700; color: #00a3e0;" id="counter4">128</div>
-        <div>Quantum qubits leveraged</div>
-    </div>
-    """, unsafe_allow_html=True)
+    """ for counter_id, value, caption in impact_stats)
+    + "</div>"
+)
 
 # Information about the system capabilities with enhanced UI
 st.markdown("<h2>About GAIA-∞</h2>", unsafe_allow_html=True)
 
-tabs = st.tabs(["Platform Capabilities", "Google Cloud Integration", "Quantum AI", "Data Sources"])
-
-with tabs[0]:
-    st.markdown("""
-    <div class="feature-card">
-        <h3>Next-Generation Climate Intelligence</h3>
-        <p>GAIA-∞ integrates multiple Google technologies to provide unprecedented climate insights:</p>
-        <ul>
-            <li><strong>Real-time Earth visualization</strong> using Google Earth Engine's petabyte-scale satellite imagery</li>
-            <li><strong>Advanced climate data analysis</strong> powered by Google Cloud AI and machine learning</li>
-            <li><strong>Quantum-enhanced climate simulations</strong> with accuracy levels impossible with classical computing</li>
-            <li><strong>Environmental monitoring networks</strong> integrating millions of IoT sensors worldwide</li>
-            <li><strong>AI-driven policy recommendations</strong> for climate action and resilience planning</li>
-            <li><strong>Digital twin technology</strong> for modeling Earth systems with unprecedented detail</li>
-        </ul>
-    </div>
-    """, unsafe_allow_html=True)
-
-with tabs[1]:
-    st.markdown("""
-    <div class="feature-card">
-        <h3>Seamless Google Cloud Integration</h3>
-        <p>GAIA-∞ leverages the full power of Google Cloud's ecosystem:</p>
-        <ul>
-            <li><strong>Google Earth Engine</strong> for planetary-scale geospatial analysis</li>
-            <li><strong>Google Cloud AI</strong> for advanced machine learning and predictive analytics</li>
-            <li><strong>BigQuery</strong> for petabyte-scale climate data analysis</li>
-            <li><strong>Vertex AI</strong> for creating and deploying climate models at scale</li>
-            <li><strong>Google Cloud IoT</strong> for sensor network integration and management</li>
-            <li><strong>Google Cloud Run</strong> for serverless, scalable climate applications</li>
-        </ul>
-    </div>
-    """, unsafe_allow_html=True)
+# About tab content: (tab label, heading, intro, ((highlight, detail), ...))
+ABOUT_TABS = (
+    ("Platform Capabilities", "Next-Generation Climate Intelligence",
+     "GAIA-∞ integrates multiple Google technologies to provide unprecedented climate insights:",
+     (("Real-time Earth visualization", "using Google Earth Engine's petabyte-scale satellite imagery"),
+      ("Advanced climate data analysis", "powered by Google Cloud AI and machine learning"),
+      ("Quantum-enhanced climate simulations", "with accuracy levels impossible with classical computing"),
+      ("Environmental monitoring networks", "integrating millions of IoT sensors worldwide"),
+      ("AI-driven policy recommendations", "for climate action and resilience planning"),
+      ("Digital twin technology", "for modeling Earth systems with unprecedented detail"))),
+    ("Google Cloud Integration", "Seamless Google Cloud Integration",
+     "GAIA-∞ leverages the full power of Google Cloud's ecosystem:",
+     (("Google Earth Engine", "for planetary-scale geospatial analysis"),
+      ("Google Cloud AI", "for advanced machine learning and predictive analytics"),
+      ("BigQuery", "for petabyte-scale climate data analysis"),
+      ("Vertex AI", "for creating and deploying climate models at scale"),
+      ("Google Cloud IoT", "for sensor network integration and management"),
+      ("Google Cloud Run", "for serverless, scalable climate applications"))),
+    ("Quantum AI", "Quantum AI Advantages",
+     "GAIA-∞ utilizes quantum computing to solve previously intractable climate modeling problems:",
+     (("Quantum Machine Learning", "for pattern recognition in complex climate datasets"),
+      ("Quantum Simulation", "of atmospheric and oceanic interactions"),
+      ("Quantum Optimization", "for energy-efficient climate solutions"),
+      ("Quantum-enhanced Weather Prediction", "with unprecedented accuracy"),
+      ("Multi-variable Quantum Analysis", "for understanding complex climate interactions"))),
+    ("Data Sources", "Comprehensive Data Sources",
+     "GAIA-∞ utilizes data from the world's leading environmental monitoring systems:",
+     (("Google Earth Engine", "satellite imagery and geospatial datasets"),
+      ("NASA", "Earth observation satellites and climate models"),
+      ("NOAA", "weather and oceanic data"),
+      ("ESA", "Copernicus program for atmospheric monitoring"),
+      ("IPCC", "climate change models and projections"),
+      ("Global sensor networks", "for real-time environmental monitoring"),
+      ("Citizen science initiatives", "for ground-truth validation"))),
+)
 
-with tabs[2]:
-    st.markdown("""
+@st.cache_data
+def _about_html(spec):
+    _, heading, intro, items = spec
+    item_html = "".join(
+        f"<li><strong>{highlight}</strong> {detail}</li>" for highlight, detail in items
+    )
+    return f"""
     <div class="feature-card">
-        <h3>Quantum AI Advantages</h3>
-        <p>GAIA-∞ utilizes quantum computing to solve previously intractable climate modeling problems:</p>
-        <ul>
-            <li><strong>Quantum Machine Learning</strong> for pattern recognition in complex climate datasets</li>
-            <li><strong>Quantum Simulation</strong> of atmospheric and oceanic interactions</li>
-            <li><strong>Quantum Optimization</strong> for energy-efficient climate solutions</li>
-            <li><strong>Quantum-enhanced Weather Prediction</strong> with unprecedented accuracy</li>
-            <li><strong>Multi-variable Quantum Analysis</strong> for understanding complex climate interactions</li>
-        </ul>
+        <h3>{heading}</h3>
+        <p>{intro}</p>
+        <ul>{item_html}</ul>
     </div>
-    """, unsafe_allow_html=True)
+    """
 
-with tabs[3]:
-    st.markdown("""
-    <div class="feature-card">
-        <h3>Comprehensive Data Sources</h3>
-        <p>GAIA-∞ utilizes data from the world's leading environmental monitoring systems:</p>
-        <ul>
-            <li><strong>Google Earth Engine</strong> satellite imagery and geospatial datasets</li>
-            <li><strong>NASA</strong> Earth observation satellites and climate models</li>
-            <li><strong>NOAA</strong> weather and oceanic data</li>
-            <li><strong>ESA</strong> Copernicus program for atmospheric monitoring</li>
-            <li><strong>IPCC</strong> climate change models and projections</li>
-            <li><strong>Global sensor networks</strong> for real-time environmental monitoring</li>
-            <li><strong>Citizen science initiatives</strong> for ground-truth validation</li>
-        </ul>
-    </div>
-    """, unsafe_allow_html=True)
+tabs = st.tabs([spec[0] for spec in ABOUT_TABS])
+for tab, spec in zip(tabs, ABOUT_TABS):
+    with tab:
+        st.html(_about_html(spec))
 
 # Call-to-action section
 st.markdown("<h2>Start Exploring</h2>", unsafe_allow_html=True)
@@ -640,7 +596,7 @@ with cta_cols[1]:
 
 # Modern footer with additional information
 st.markdown("---")
-st.markdown("""
+st.html("""
 <div style="display: flex; justify-content: space-between; align-items: center; padding: 20px 0;">
     <div>
         <h3 style="margin-bottom: 10px;">GAIA-∞: Climate Intelligence Platform</h3>
@@ -651,28 +607,4 @@ st.markdown("""
         <p style="font-size: 0.8rem;">Version 1.0.0 • Quantum Enhanced</p>
     </div>
 </div>
-""", unsafe_allow_html=True)
-
-# Add JavaScript for enhanced interactivity
-st.markdown("""
-<script>
-    // This script would enhance interactivity, but Streamlit's iframe limitations may restrict some functionality
-    console.log("GAIA-∞ Platform initialized");
-</script>
-""", unsafe_allow_html=True)
-
-# Initialize the database
-if 'db_initialized' not in st.session_state:
-    # Check if database connection is working
-    if check_connection():
-        logger.info("Database connection successful")
-        # Initialize the database tables
-        if init_db():
-            logger.info("Database initialized successfully")
-            st.session_state.db_initialized = True
-        else:
-            logger.error("Failed to initialize database")
-            st.session_state.db_initialized = False
-    else:
-        logger.error("Database connection failed")
-        st.session_state.db_initialized = False
+""")
@@ -4,12 +4,13 @@ Database connection module for GAIA-∞ Climate Intelligence Platform.
 
 import os
 import logging
+import functools
+import orjson
+from contextlib import contextmanager
 from sqlalchemy import create_engine, MetaData, inspect
-from sqlalchemy.orm import sessionmaker, scoped_session
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker, scoped_session, DeclarativeBase
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Get the database connection string from environment variables
@@ -31,16 +32,61 @@ if not DATABASE_URL:
         logger.warning("Database environment variables not found. Using default SQLite database.")
         DATABASE_URL = "sqlite:///gaia_climate_platform.db"
 
-# Create the SQLAlchemy engine
-engine = create_engine(DATABASE_URL, echo=False)
+def _json_default(value):
+    """Slow path for values orjson can't encode natively, e.g. object or complex arrays."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def _json_serializer(value):
+    """Serialize JSON column values with orjson, passing NumPy arrays and scalars through natively."""
+    return orjson.dumps(
+        value,
+        default=_json_default,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    ).decode()
+
+@functools.lru_cache(maxsize=1)
+def get_engine():
+    """
+    Get the shared SQLAlchemy engine, creating it on first use.
+    
+    The engine owns a single connection pool for the whole process, so every
+    Streamlit session reuses pooled connections instead of reconnecting.
+    
+    Returns:
+        SQLAlchemy engine object
+    """
+    # psycopg2's batched executemany helpers only exist on the PostgreSQL dialect
+    dialect_options = {"executemany_mode": "values_plus_batch"} if DATABASE_URL.startswith("postgresql") else {}
+    return create_engine(
+        DATABASE_URL,
+        echo=False,
+        pool_size=20,
+        max_overflow=10,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
+        insertmanyvalues_page_size=10000,
+        query_cache_size=1200,
+        future=True,
+        **dialect_options
+    )
 
 # Create a session factory
-session_factory = sessionmaker(bind=engine)
-Session = scoped_session(session_factory)
+# Instances stay readable after the scope commits and the session closes
+session_factory = sessionmaker(expire_on_commit=False)
+
+def _new_session():
+    # Bind on first use so importing this module does not create the engine
+    return session_factory(bind=get_engine())
+
+Session = scoped_session(_new_session)
 
 # Create a base class for declarative models
-Base = declarative_base()
-Base.metadata.bind = engine
+class Base(DeclarativeBase):
+    pass
 
 def get_db_session():
     """
@@ -55,21 +101,70 @@ def close_db_session(session):
     """
     Close a database session.
     
+    Closing returns the connection to the pool but keeps the session in the
+    thread-local ``scoped_session`` registry, so the next call on the same
+    thread reuses it. Callers should call this in a ``finally`` block.
+    
     Args:
         session: SQLAlchemy session object
     """
     session.close()
 
+def remove_db_session():
+    """
+    Discard the current thread's session from the registry.
+    
+    Call this on request or thread teardown.
+    """
+    Session.remove()
+
+@contextmanager
+def session_scope():
+    """
+    Provide a transactional scope around a series of operations.
+    
+    Commits on success, rolls back on error and always closes the
+    thread-local session, releasing its connection to the pool.
+    
+    Yields:
+        SQLAlchemy session object
+    """
+    session = Session()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+# Set once the schema has been created and verified in this process
+_INITIALIZED = False
+
 def init_db():
     """
     Initialize the database by creating all tables.
+    
+    Table creation and verification run once per process; later calls
+    return immediately without querying the database.
     """
+    global _INITIALIZED
+    if _INITIALIZED:
+        return True
+    
     try:
         # Import all models to ensure they're registered with the Base
         from database.models import ClimateData, User, UserPreference, SavedLocation, Alert, SimulationResult, EarthEngineImage
         
         # Create all tables
-        Base.metadata.create_all(bind=engine)
+        engine = get_engine()
+        Base.metadata.create_all(bind=engine, checkfirst=True)
+        
+        # create_all skips existing tables, so apply newer columns, unique
+        # keys, indexes and types to them separately
+        from database.migrations import upgrade_schema
+        upgrade_schema(engine)
         
         # Verify tables exist
         inspector = inspect(engine)
@@ -82,6 +177,7 @@ def init_db():
             return False
             
         logger.info(f"Database tables verified: {', '.join(table_names)}")
+        _INITIALIZED = True
         return True
     except Exception as e:
         logger.error(f"Error initializing database: {str(e)}")
@@ -95,12 +191,8 @@ def check_connection():
         bool: True if connection is successful, False otherwise
     """
     try:
-        # Try to execute a simple query
-        from sqlalchemy import text
-        with engine.connect() as connection:
-            result = connection.execute(text("SELECT 1"))
-            result.fetchone()  # Actually fetch the result to complete the query
-            connection.commit()  # Commit any pending transaction
+        # pool_pre_ping validates the connection on checkout, so no probe query is needed
+        get_engine().connect().close()
         logger.info("Database connection successful")
         return True
     except Exception as e:
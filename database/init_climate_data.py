@@ -3,26 +3,39 @@ This module initializes the database with climate data and models
 for the GAIA-∞ Climate Intelligence Platform.
 """
 
-import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import logging
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import case, func, select, update
 
-from sqlalchemy.exc import SQLAlchemyError
-from database.connection import get_db_session, close_db_session, init_db
+from database.connection import get_engine, session_scope, init_db
+from utils.logging_setup import configure_logging
 # Import models
-from database.models import ClimateData, Alert, SimulationResult, EarthEngineImage, User
+from database.models import ClimateData, Alert, SimulationResult, EarthEngineImage
 from database.operations import (
-    store_climate_data, create_alert, store_simulation_result, 
-    store_earth_engine_image, create_user
+    bulk_insert, copy_insert, upsert, create_user, pack_simulation_results, clear_read_caches
 )
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 
+# Shared meta_data values for the seed climate rows
+META_GLOBAL_AVG = {"type": "global_average"}
+META_GLOBAL_LOC = {"location": "global_average"}
+META_ICE_SEPT = {"type": "arctic_september_minimum"}
+
+# Source recorded on the seeded alerts
+SEED_ALERT_SOURCE = "GAIA-∞ Climate Intelligence"
+
+# Precomputed bcrypt hashes (cost 12) so reseeding never runs the KDF
+_HASHES = {
+    "admin": "$2b$12$QqHSJBQ5S6gD8XK5BFVlp.l2mzKqm8LBx4QYcYBoTvMC8U9VPY/jK",  # "admin123"
+    "demo": "$2b$12$m3O9UrQNI6C/zKSuXa.kXOnj5TwEAf.Zz5BO4.KY8lPZtC4w9kd7y"  # "demo123"
+}
+
 def initialize_database():
     """Initialize the database schema and populate with initial data."""
     try:
@@ -32,10 +45,22 @@ def initialize_database():
         
         # Create initial data
         create_initial_users()
-        create_initial_climate_data()
-        create_initial_alerts()
-        create_initial_simulation_results()
-        create_initial_earth_engine_data()
+        
+        # The remaining seeds touch disjoint tables, so they run concurrently,
+        # each in its own thread-local session. SQLite serializes writers, so
+        # it gets a single worker.
+        seed_functions = [
+            create_initial_climate_data,
+            create_initial_alerts,
+            create_initial_simulation_results,
+            create_initial_earth_engine_data
+        ]
+        max_workers = 1 if get_engine().dialect.name == "sqlite" else len(seed_functions)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(_run_seed, seed_functions))
+        
+        # The seeds write through upsert/bulk helpers, not the cached writers
+        clear_read_caches()
         
         logger.info("Database initialized successfully with initial data")
         return True
@@ -43,6 +68,11 @@ def initialize_database():
         logger.error(f"Database initialization failed: {str(e)}")
         return False
 
+def _run_seed(create_function):
+    """Run a seed function in its own session with a single commit."""
+    with session_scope() as session, session.no_autoflush:
+        create_function(session)
+
 def create_initial_users():
     """Create initial users for the system."""
     try:
@@ -50,7 +80,7 @@ def create_initial_users():
         admin_created = create_user(
             username="admin",
             email="admin@gaia-infinity.ai",
-            password_hash="$2b$12$QqHSJBQ5S6gD8XK5BFVlp.l2mzKqm8LBx4QYcYBoTvMC8U9VPY/jK",  # hashed "admin123"
+            password_hash=_HASHES["admin"],
             role="admin"
         )
         
@@ -58,7 +88,7 @@ def create_initial_users():
         demo_created = create_user(
             username="demo",
             email="demo@gaia-infinity.ai",
-            password_hash="$2b$12$m3O9UrQNI6C/zKSuXa.kXOnj5TwEAf.Zz5BO4.KY8lPZtC4w9kd7y",  # hashed "demo123"
+            password_hash=_HASHES["demo"],
             role="user"
         )
         
@@ -70,188 +100,219 @@ def create_initial_users():
     except Exception as e:
         logger.error(f"Error creating initial users: {str(e)}")
 
-def create_initial_climate_data():
+def _climate_row(data_type, timestamp, value, source=None, is_prediction=False,
+                 prediction_model=None, meta_data=None):
+    """Build a ClimateData mapping for bulk insertion."""
+    return {
+        "data_type": data_type,
+        "timestamp": timestamp,
+        "value": float(value),
+        "source": source,
+        "is_prediction": is_prediction,
+        "prediction_model": prediction_model,
+        "meta_data": meta_data
+    }
+
+def _yearly_timestamps(years, month, day):
+    """Build one timestamp per year on a fixed month and day, vectorized."""
+    import pandas as pd  # deferred: only the climate seed needs pandas
+    dates = pd.to_datetime(pd.DataFrame({"year": years, "month": month, "day": day}))
+    return pd.DatetimeIndex(dates).to_pydatetime()
+
+def create_initial_climate_data(session):
     """Create initial climate data for the system."""
+    import pandas as pd  # deferred: only the climate seed needs pandas
     try:
+        rows = []
+        # Seeded generator keeps the initial data reproducible across runs
+        rng = np.random.default_rng(int(os.environ.get("GAIA_SEED", "42")))
+        
         # Generate historical temperature data
         current_year = datetime.now().year
         start_year = 1880
         
-        # Temperature anomaly data (based on NASA GISS data pattern)
+        # Year ranges of each series; CO2 records start in 1960 (Mauna Loa),
+        # sea level in 1993 (satellite altimetry), sea ice in 1979 (satellites)
         years = list(range(start_year, current_year + 1))
+        co2_years = list(range(1960, current_year + 1)) if start_year < 1960 else years
+        sea_level_years = list(range(1993, current_year + 1))
+        ice_years = list(range(1979, current_year + 1))
+        future_years = list(range(current_year + 1, current_year + 31))
+        
+        # Draw all noise in one RNG call and hand out contiguous windows
+        noise_sizes = [len(years), len(co2_years) * 12, len(sea_level_years),
+                       len(ice_years)] + [len(future_years)] * 4
+        (temp_noise, co2_noise, sea_level_noise, ice_noise, future_temp_noise,
+         future_co2_noise, future_sea_level_noise, future_ice_noise) = np.split(
+            rng.standard_normal(sum(noise_sizes)), np.cumsum(noise_sizes)[:-1])
+        
+        # Temperature anomaly data (based on NASA GISS data pattern)
         base_anomaly = np.linspace(-0.2, 0.3, 100)  # 1880-1979
         accelerated_anomaly = np.linspace(0.3, 1.1, current_year - 1979)  # 1980-present
         
         temperature_anomalies = np.concatenate([base_anomaly[:100], accelerated_anomaly])
-        noise = np.random.normal(0, 0.1, len(years))
-        temperature_anomalies = temperature_anomalies + noise
+        temperature_anomalies = temperature_anomalies + 0.1 * temp_noise
         
         # Store temperature data
-        for i, year in enumerate(years):
-            store_climate_data(
+        temperature_timestamps = _yearly_timestamps(years, 7, 1)
+        for timestamp, temperature in zip(temperature_timestamps, temperature_anomalies):
+            rows.append(_climate_row(
                 data_type="temperature",
-                timestamp=datetime(year, 7, 1),
-                value=temperature_anomalies[i],
+                timestamp=timestamp,
+                value=temperature,
                 source="GAIA-∞ Initial Data",
                 is_prediction=False,
-                meta_data={"type": "global_average"}
-            )
+                meta_data=META_GLOBAL_AVG
+            ))
         
         # Generate CO2 concentration data (based on Mauna Loa pattern)
         if start_year < 1960:
             # Pre-1960 data is more sparse
-            co2_years = list(range(1960, current_year + 1))
             base_co2 = 315  # ppm in 1960
         else:
-            co2_years = years
             base_co2 = 290  # estimated for 1880
             
-        for i, year in enumerate(co2_years):
-            # CO2 increase accelerates over time
-            if year < 1980:
-                co2_increase = 0.85  # ppm per year
-            elif year < 2000:
-                co2_increase = 1.5  # ppm per year
-            else:
-                co2_increase = 2.3  # ppm per year
-                
-            year_idx = year - co2_years[0]
-            co2_value = base_co2 + sum([co2_increase for _ in range(year_idx)])
-            
-            # Add seasonal variation and noise
-            months = list(range(1, 13))
-            for month in months:
-                # CO2 has seasonal cycle, highest in May, lowest in October
-                seasonal_factor = 2.0 * np.sin(2 * np.pi * (month - 1) / 12)
-                monthly_co2 = co2_value + seasonal_factor + np.random.normal(0, 0.3)
-                
-                store_climate_data(
-                    data_type="co2",
-                    timestamp=datetime(year, month, 15),
-                    value=monthly_co2,
-                    source="GAIA-∞ Initial Data",
-                    is_prediction=False,
-                    meta_data={"location": "global_average"}
-                )
+        # CO2 increase accelerates over time (ppm per year by era)
+        co2_year_arr = np.asarray(co2_years)
+        co2_rates = np.select([co2_year_arr < 1980, co2_year_arr < 2000], [0.85, 1.5], default=2.3)
+        yearly_co2 = base_co2 + np.cumsum(co2_rates) - co2_rates[0]
+        co2_value = yearly_co2[-1]
+        
+        # CO2 has seasonal cycle, highest in May, lowest in October
+        months = np.arange(1, 13)
+        seasonal = 2.0 * np.sin(2 * np.pi * (months - 1) / 12)
+        monthly_co2 = (yearly_co2[:, None] + seasonal[None, :]
+                       + 0.3 * co2_noise.reshape(len(co2_years), 12))
+        
+        # Mid-month timestamps in the same year-major order as monthly_co2.ravel()
+        co2_timestamps = (pd.date_range(f"{co2_years[0]}-01-01", periods=monthly_co2.size, freq="MS")
+                          + pd.Timedelta(days=14)).to_pydatetime()
+        for timestamp, value in zip(co2_timestamps, monthly_co2.ravel()):
+            rows.append(_climate_row(
+                data_type="co2",
+                timestamp=timestamp,
+                value=value,
+                source="GAIA-∞ Initial Data",
+                is_prediction=False,
+                meta_data=META_GLOBAL_LOC
+            ))
         
         # Generate sea level data (based on satellite altimetry pattern)
         # Sea level data starts from 1993 (satellite era)
-        sea_level_years = list(range(1993, current_year + 1))
         base_sea_level = 0  # mm in 1993 (relative)
         sea_level_rate = 3.3  # mm per year
         
-        for i, year in enumerate(sea_level_years):
-            sea_level = base_sea_level + (i * sea_level_rate) + np.random.normal(0, 1)
-            
-            store_climate_data(
+        sea_level_idx = np.arange(len(sea_level_years))
+        sea_levels = (base_sea_level + sea_level_idx * sea_level_rate
+                      + sea_level_noise)
+        
+        sea_level_timestamps = _yearly_timestamps(sea_level_years, 6, 30)
+        for timestamp, sea_level in zip(sea_level_timestamps, sea_levels):
+            rows.append(_climate_row(
                 data_type="sea_level",
-                timestamp=datetime(year, 6, 30),
+                timestamp=timestamp,
                 value=sea_level,
                 source="GAIA-∞ Initial Data",
                 is_prediction=False,
-                meta_data={"type": "global_average"}
-            )
+                meta_data=META_GLOBAL_AVG
+            ))
         
         # Generate Arctic sea ice data
-        ice_years = list(range(1979, current_year + 1))  # Satellite data starts 1979
         base_ice_extent = 12.5  # million sq km in 1979
         
-        for i, year in enumerate(ice_years):
-            # Ice loss accelerates over time
-            if year < 2000:
-                ice_loss_rate = 0.05  # million sq km per year
-            elif year < 2010:
-                ice_loss_rate = 0.1  # million sq km per year
-            else:
-                ice_loss_rate = 0.15  # million sq km per year
-            
-            ice_extent = base_ice_extent - (i * ice_loss_rate) + np.random.normal(0, 0.2)
-            ice_extent = max(ice_extent, 3.0)  # Ensure physical reasonability
-            
-            store_climate_data(
+        # Ice loss accelerates over time (million sq km per year by era)
+        ice_year_arr = np.asarray(ice_years)
+        ice_loss_rates = np.select([ice_year_arr < 2000, ice_year_arr < 2010], [0.05, 0.1], default=0.15)
+        ice_extents = (base_ice_extent - np.cumsum(ice_loss_rates) + ice_loss_rates[0]
+                       + 0.2 * ice_noise)
+        ice_extents = np.maximum(ice_extents, 3.0)  # Ensure physical reasonability
+        ice_extent = ice_extents[-1]
+        
+        ice_timestamps = _yearly_timestamps(ice_years, 9, 15)  # September minimum
+        for timestamp, ice_extent_value in zip(ice_timestamps, ice_extents):
+            rows.append(_climate_row(
                 data_type="ice_extent",
-                timestamp=datetime(year, 9, 15),  # September minimum
-                value=ice_extent,
+                timestamp=timestamp,
+                value=ice_extent_value,
                 source="GAIA-∞ Initial Data",
                 is_prediction=False,
-                meta_data={"type": "arctic_september_minimum"}
-            )
+                meta_data=META_ICE_SEPT
+            ))
             
         # Generate some future predictions
-        future_years = list(range(current_year + 1, current_year + 31))
         last_temp = temperature_anomalies[-1]
         last_co2 = co2_value
         last_sea_level = base_sea_level + ((len(sea_level_years) - 1) * sea_level_rate)
         last_ice = ice_extent
         
+        # Business as usual trends: temperature and sea level accelerate,
+        # CO2 keeps rising and ice extent declines
+        steps = np.arange(1, len(future_years) + 1)
+        future_temps = last_temp + 0.03 * steps + 0.05 * future_temp_noise
+        future_co2s = last_co2 + 2.5 * steps + future_co2_noise
+        future_sea_levels = last_sea_level + 3.5 * steps + future_sea_level_noise
+        future_ices = np.maximum(0, last_ice - 0.15 * steps + 0.1 * future_ice_noise)
+        
+        future_july = _yearly_timestamps(future_years, 7, 1)
+        future_june_end = _yearly_timestamps(future_years, 6, 30)
+        future_september = _yearly_timestamps(future_years, 9, 15)
+        
         # Business as usual scenario
-        for i, year in enumerate(future_years):
-            # Temperature (accelerating)
-            future_temp = last_temp + (0.03 * (i + 1)) + np.random.normal(0, 0.05)
-            
-            store_climate_data(
+        for i in range(len(future_years)):
+            rows.append(_climate_row(
                 data_type="temperature",
-                timestamp=datetime(year, 7, 1),
-                value=future_temp,
+                timestamp=future_july[i],
+                value=future_temps[i],
                 source="GAIA-∞ Prediction",
                 is_prediction=True,
                 prediction_model="Business as Usual",
-                meta_data={"type": "global_average"}
-            )
-            
-            # CO2 (continuing increase)
-            future_co2 = last_co2 + (2.5 * (i + 1)) + np.random.normal(0, 1)
-            
-            store_climate_data(
+                meta_data=META_GLOBAL_AVG
+            ))
+            rows.append(_climate_row(
                 data_type="co2",
-                timestamp=datetime(year, 7, 1),
-                value=future_co2,
+                timestamp=future_july[i],
+                value=future_co2s[i],
                 source="GAIA-∞ Prediction",
                 is_prediction=True,
                 prediction_model="Business as Usual",
-                meta_data={"type": "global_average"}
-            )
-            
-            # Sea level (accelerating)
-            future_sea_level = last_sea_level + (3.5 * (i + 1)) + np.random.normal(0, 1)
-            
-            store_climate_data(
+                meta_data=META_GLOBAL_AVG
+            ))
+            rows.append(_climate_row(
                 data_type="sea_level",
-                timestamp=datetime(year, 6, 30),
-                value=future_sea_level,
+                timestamp=future_june_end[i],
+                value=future_sea_levels[i],
                 source="GAIA-∞ Prediction",
                 is_prediction=True,
                 prediction_model="Business as Usual",
-                meta_data={"type": "global_average"}
-            )
-            
-            # Ice extent (declining)
-            future_ice = max(0, last_ice - (0.15 * (i + 1)) + np.random.normal(0, 0.1))
-            
-            store_climate_data(
+                meta_data=META_GLOBAL_AVG
+            ))
+            rows.append(_climate_row(
                 data_type="ice_extent",
-                timestamp=datetime(year, 9, 15),
-                value=future_ice,
+                timestamp=future_september[i],
+                value=future_ices[i],
                 source="GAIA-∞ Prediction",
                 is_prediction=True,
                 prediction_model="Business as Usual",
-                meta_data={"type": "arctic_september_minimum"}
-            )
+                meta_data=META_ICE_SEPT
+            ))
         
+        copy_insert(session, ClimateData, rows)
         logger.info("Initial climate data created successfully")
             
     except Exception as e:
         logger.error(f"Error creating initial climate data: {str(e)}")
+        raise
 
-def create_initial_alerts():
+def create_initial_alerts(session):
     """Create initial environmental alerts for the system."""
     try:
         # Create some current alerts
         current_date = datetime.now()
         expiry_date = current_date + timedelta(days=7)
+        alert_rows = []
         
         # Alert 1: Extreme heat
-        create_alert(
+        alert_rows.append(dict(
             alert_type="extreme_weather",
             severity=4,  # High
             region="South Asia",
@@ -260,11 +321,12 @@ def create_initial_alerts():
             title="Extreme Heat Wave: Northern India",
             description="Temperatures exceeding 45°C (113°F) expected to affect over 100 million people across northern India for the next 5-7 days. Heat wave conditions expected to impact agriculture, increase water demand, and pose significant health risks.",
             expires_at=expiry_date,
-            source="GAIA-∞ Climate Intelligence"
-        )
+            source=SEED_ALERT_SOURCE,
+            seed_key="heat_wave_northern_india"
+        ))
         
         # Alert 2: Drought
-        create_alert(
+        alert_rows.append(dict(
             alert_type="drought",
             severity=3,  # Medium-high
             region="Western United States",
@@ -273,11 +335,12 @@ def create_initial_alerts():
             title="Severe Drought Conditions: Western US",
             description="Persistent drought conditions worsening across Western states, with over 75% of the region experiencing moderate to severe drought. Water reservoirs at critical levels and increasing wildfire risk.",
             expires_at=current_date + timedelta(days=90),  # Longer term alert
-            source="GAIA-∞ Climate Intelligence"
-        )
+            source=SEED_ALERT_SOURCE,
+            seed_key="drought_western_us"
+        ))
         
         # Alert 3: Flooding
-        create_alert(
+        alert_rows.append(dict(
             alert_type="flood",
             severity=5,  # Critical
             region="Southeast Asia",
@@ -286,11 +349,12 @@ def create_initial_alerts():
             title="Monsoon Flooding: Vietnam and Cambodia",
             description="Heavy monsoon rainfall causing severe flooding across multiple provinces. Over 100,000 people displaced and critical infrastructure damaged. Additional rainfall expected to worsen conditions over the next 72 hours.",
             expires_at=current_date + timedelta(days=5),
-            source="GAIA-∞ Climate Intelligence"
-        )
+            source=SEED_ALERT_SOURCE,
+            seed_key="monsoon_flooding_vietnam_cambodia"
+        ))
         
         # Alert 4: Sea level
-        create_alert(
+        alert_rows.append(dict(
             alert_type="sea_level",
             severity=3,  # Medium-high
             region="Pacific Islands",
@@ -299,11 +363,12 @@ def create_initial_alerts():
             title="King Tide Coastal Flooding: Fiji",
             description="Exceptionally high 'king tides' combined with rising sea levels causing significant coastal flooding in low-lying communities. Infrastructure damage and saltwater contamination of freshwater resources reported.",
             expires_at=current_date + timedelta(days=3),
-            source="GAIA-∞ Climate Intelligence"
-        )
+            source=SEED_ALERT_SOURCE,
+            seed_key="king_tide_fiji"
+        ))
         
         # Alert 5: Wildfire
-        create_alert(
+        alert_rows.append(dict(
             alert_type="wildfire",
             severity=4,  # High
             region="Mediterranean",
@@ -312,30 +377,60 @@ def create_initial_alerts():
             title="Extreme Fire Danger: Portugal and Spain",
             description="Combination of drought conditions, high temperatures, and strong winds creating extreme fire danger across the Iberian Peninsula. Multiple active fires already reported with rapid spread potential.",
             expires_at=current_date + timedelta(days=10),
-            source="GAIA-∞ Climate Intelligence"
-        )
+            source=SEED_ALERT_SOURCE,
+            seed_key="fire_danger_iberia"
+        ))
         
+        _claim_legacy_seed_alerts(session, alert_rows)
+        upsert(session, Alert, alert_rows, ['seed_key'],
+               ['title', 'severity', 'description', 'expires_at'])
         logger.info("Initial alerts created successfully")
             
     except Exception as e:
         logger.error(f"Error creating initial alerts: {str(e)}")
+        raise
 
-def create_initial_simulation_results():
+def _claim_legacy_seed_alerts(session, alert_rows):
+    """
+    Key seed alerts written before seed_key existed, so the upsert updates them.
+
+    Only the newest unkeyed copy of each seed title is claimed, and only until
+    the first seed alert carries a key; older copies are left untouched.
+    """
+    if session.scalar(select(Alert.id).where(Alert.seed_key.is_not(None)).limit(1)) is not None:
+        return
+    
+    keys = {row["title"]: row["seed_key"] for row in alert_rows}
+    newest = (
+        select(func.max(Alert.id))
+        .where(Alert.seed_key.is_(None), Alert.source == SEED_ALERT_SOURCE, Alert.title.in_(keys))
+        .group_by(Alert.title)
+    )
+    session.execute(
+        update(Alert)
+        .where(Alert.id.in_(newest))
+        .values(seed_key=case(keys, value=Alert.title))
+        .execution_options(synchronize_session=False)
+    )
+
+def create_initial_simulation_results(session):
     """Create initial simulation results for the system."""
     try:
         # Create simulation results for different scenarios
         current_year = datetime.now().year
         projection_years = list(range(current_year, current_year + 81))
+        i = np.arange(len(projection_years))
+        simulation_rows = []
         
         # Business as usual scenario
         bau_scenario = {
-            "temperature": [1.1 + (0.035 * i + 0.0003 * i**2) for i in range(len(projection_years))],
-            "co2": [417 + (2.5 * i) for i in range(len(projection_years))],
-            "sea_level": [0 + (3.5 * i + 0.015 * i**2) for i in range(len(projection_years))],
-            "arctic_ice": [max(0, 10.5 - (0.15 * i)) for i in range(len(projection_years))]
+            "temperature": (1.1 + (0.035 * i + 0.0003 * i**2)),
+            "co2": (417 + (2.5 * i)),
+            "sea_level": (0 + (3.5 * i + 0.015 * i**2)),
+            "arctic_ice": np.maximum(0, 10.5 - (0.15 * i))
         }
         
-        store_simulation_result(
+        simulation_rows.append(dict(
             name="Business as Usual Projection",
             scenario="business_as_usual",
             parameters={
@@ -348,17 +443,17 @@ def create_initial_simulation_results():
                 "data": bau_scenario
             },
             description="Simulation of climate impacts under current emissions trajectory with no additional mitigation policies."
-        )
+        ))
         
         # Moderate mitigation scenario
         mod_scenario = {
-            "temperature": [1.1 + (0.025 * i + 0.0001 * i**2) for i in range(len(projection_years))],
-            "co2": [417 + (1.8 * i) for i in range(len(projection_years))],
-            "sea_level": [0 + (3.2 * i + 0.01 * i**2) for i in range(len(projection_years))],
-            "arctic_ice": [max(0, 10.5 - (0.1 * i)) for i in range(len(projection_years))]
+            "temperature": (1.1 + (0.025 * i + 0.0001 * i**2)),
+            "co2": (417 + (1.8 * i)),
+            "sea_level": (0 + (3.2 * i + 0.01 * i**2)),
+            "arctic_ice": np.maximum(0, 10.5 - (0.1 * i))
         }
         
-        store_simulation_result(
+        simulation_rows.append(dict(
             name="Moderate Mitigation Projection",
             scenario="moderate_mitigation",
             parameters={
@@ -371,17 +466,17 @@ def create_initial_simulation_results():
                 "data": mod_scenario
             },
             description="Simulation of climate impacts with moderate emission reductions consistent with partial implementation of current policies."
-        )
+        ))
         
         # Strong mitigation scenario
         strong_scenario = {
-            "temperature": [1.1 + (0.015 * i) for i in range(len(projection_years))],
-            "co2": [417 + min(0.8 * i, 40) for i in range(len(projection_years))],
-            "sea_level": [0 + (2.8 * i) for i in range(len(projection_years))],
-            "arctic_ice": [max(5, 10.5 - (0.05 * i)) for i in range(len(projection_years))]
+            "temperature": (1.1 + (0.015 * i)),
+            "co2": (417 + np.minimum(0.8 * i, 40)),
+            "sea_level": (0 + (2.8 * i)),
+            "arctic_ice": np.maximum(5, 10.5 - (0.05 * i))
         }
         
-        store_simulation_result(
+        simulation_rows.append(dict(
             name="Strong Mitigation Projection",
             scenario="strong_mitigation",
             parameters={
@@ -394,17 +489,17 @@ def create_initial_simulation_results():
                 "data": strong_scenario
             },
             description="Simulation of climate impacts with strong emission reductions aligned with the Paris Agreement 1.5°C goal."
-        )
+        ))
         
         # Net zero scenario
         net_zero_scenario = {
-            "temperature": [1.1 + (0.01 * min(i, 30)) for i in range(len(projection_years))],
-            "co2": [417 + 0.5 * min(i, 30) - max(0, 0.5 * (i - 30)) for i in range(len(projection_years))],
-            "sea_level": [0 + (2.5 * i) for i in range(len(projection_years))],
-            "arctic_ice": [max(8, 10.5 - (0.03 * min(i, 30))) for i in range(len(projection_years))]
+            "temperature": (1.1 + (0.01 * np.minimum(i, 30))),
+            "co2": (417 + 0.5 * np.minimum(i, 30) - np.maximum(0, 0.5 * (i - 30))),
+            "sea_level": (0 + (2.5 * i)),
+            "arctic_ice": np.maximum(8, 10.5 - (0.03 * np.minimum(i, 30)))
         }
         
-        store_simulation_result(
+        simulation_rows.append(dict(
             name="Net Zero by 2050 Projection",
             scenario="net_zero",
             parameters={
@@ -417,20 +512,30 @@ def create_initial_simulation_results():
                 "data": net_zero_scenario
             },
             description="Simulation of climate impacts with rapid transition to net zero emissions by 2050, followed by negative emissions."
-        )
+        ))
         
+        # Projection arrays go to the compressed results_blob, not the JSON column,
+        # as float32: ample for these curves and half the bytes to store and load
+        for row in simulation_rows:
+            data = row["results"]["data"]
+            row["results"]["data"] = {key: np.asarray(series, dtype=np.float32) for key, series in data.items()}
+            row["results"], row["results_blob"] = pack_simulation_results(row["results"])
+        
+        bulk_insert(session, SimulationResult, simulation_rows)
         logger.info("Initial simulation results created successfully")
             
     except Exception as e:
         logger.error(f"Error creating initial simulation results: {str(e)}")
+        raise
 
-def create_initial_earth_engine_data():
+def create_initial_earth_engine_data(session):
     """Create initial Earth Engine dataset references."""
     try:
         # Add key Earth Engine datasets
+        image_rows = []
         
         # Dataset 1: Land Surface Temperature
-        store_earth_engine_image(
+        image_rows.append(dict(
             dataset_id="MODIS/006/MOD11A1",
             display_name="Land Surface Temperature",
             description="MODIS Land Surface Temperature daily global 1km resolution dataset showing Earth's skin temperature.",
@@ -440,10 +545,10 @@ def create_initial_earth_engine_data():
                 "max": 40,
                 "palette": ["blue", "purple", "cyan", "green", "yellow", "red"]
             }
-        )
+        ))
         
         # Dataset 2: Vegetation Index
-        store_earth_engine_image(
+        image_rows.append(dict(
             dataset_id="MODIS/006/MOD13A2",
             display_name="Vegetation Index (NDVI)",
             description="MODIS Normalized Difference Vegetation Index (NDVI) showing vegetation health and density.",
@@ -453,10 +558,10 @@ def create_initial_earth_engine_data():
                 "max": 10000,
                 "palette": ["brown", "yellow", "green", "darkgreen"]
             }
-        )
+        ))
         
         # Dataset 3: Precipitation
-        store_earth_engine_image(
+        image_rows.append(dict(
             dataset_id="NASA/GPM_L3/IMERG_V06",
             display_name="Global Precipitation",
             description="NASA Global Precipitation Measurement dataset showing precipitation rates.",
@@ -466,10 +571,10 @@ def create_initial_earth_engine_data():
                 "max": 10,
                 "palette": ["white", "blue", "purple", "red"]
             }
-        )
+        ))
         
         # Dataset 4: Sea Surface Temperature
-        store_earth_engine_image(
+        image_rows.append(dict(
             dataset_id="NASA/OCEANDATA/MODIS-Terra/L3SMI",
             display_name="Sea Surface Temperature",
             description="MODIS Terra Ocean Color dataset showing sea surface temperature.",
@@ -479,10 +584,10 @@ def create_initial_earth_engine_data():
                 "max": 30,
                 "palette": ["blue", "cyan", "green", "yellow", "red"]
             }
-        )
+        ))
         
         # Dataset 5: Carbon Monoxide
-        store_earth_engine_image(
+        image_rows.append(dict(
             dataset_id="COPERNICUS/S5P/NRTI/L3_CO",
             display_name="Carbon Monoxide",
             description="Sentinel-5P Carbon Monoxide concentration in the atmosphere, indicator of air quality and pollution.",
@@ -492,12 +597,15 @@ def create_initial_earth_engine_data():
                 "max": 0.05,
                 "palette": ["black", "blue", "purple", "cyan", "green", "yellow", "red"]
             }
-        )
+        ))
         
+        upsert(session, EarthEngineImage, image_rows, ['dataset_id'],
+               ['display_name', 'description', 'visualization_params'])
         logger.info("Initial Earth Engine data created successfully")
             
     except Exception as e:
         logger.error(f"Error creating initial Earth Engine data: {str(e)}")
+        raise
 
 if __name__ == "__main__":
     initialize_database()
\ No newline at end of file
@@ -0,0 +1,251 @@
+"""
+In-place schema upgrades for databases created by earlier versions of the models.
+
+``create_all`` only creates missing tables, so columns, unique keys, indexes and
+column types added to tables that already exist are applied here. Every step
+inspects the live schema first, so running it on each ``init_db`` is safe.
+No step deletes rows: where existing data blocks a change, it is skipped and
+logged instead.
+"""
+
+import logging
+from sqlalchemy import bindparam, inspect, text, SmallInteger, Enum, DateTime
+from sqlalchemy.dialects import postgresql
+
+from database.connection import Base
+from database.models import CLIMATE_DATA_TYPES, ALERT_TYPES
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Unique keys the upserts conflict on, as (table, column, index name). The
+# PostgreSQL names match what create_all gives the model constraints.
+_UNIQUE_KEYS = (
+    ('alerts', 'seed_key', 'uq_alerts_seed_key'),
+    ('earth_engine_images', 'dataset_id', 'uq_ee_dataset'),
+    ('user_preferences', 'user_id', 'user_preferences_user_id_key'),
+)
+
+# Plain indexes superseded by a unique key on the same column
+_DROPPED_INDEXES = ('ix_ee_dataset',)
+
+# Unique keys no longer in the models, as (table, column)
+_DROPPED_UNIQUE_KEYS = (
+    ('alerts', 'title'),
+)
+
+# PostgreSQL column type changes: (table, column, enum type name, values)
+_PG_ENUM_COLUMNS = (
+    ('climate_data', 'data_type', 'climate_data_type', CLIMATE_DATA_TYPES),
+    ('alerts', 'alert_type', 'alert_type', ALERT_TYPES),
+)
+
+_PG_SMALLINT_COLUMNS = (
+    ('alerts', 'severity'),
+)
+
+_PG_JSONB_COLUMNS = (
+    ('user_preferences', 'custom_settings'),
+    ('climate_data', 'meta_data'),
+    ('simulation_results', 'parameters'),
+    ('simulation_results', 'results'),
+    ('earth_engine_images', 'image_properties'),
+    ('earth_engine_images', 'visualization_params'),
+)
+
+# Naive UTC timestamps that became timezone-aware with a now() server default
+_PG_TIMESTAMPTZ_COLUMNS = (
+    ('users', 'created_at'),
+    ('saved_locations', 'created_at'),
+    ('climate_data', 'created_at'),
+    ('alerts', 'issued_at'),
+    ('simulation_results', 'created_at'),
+    ('earth_engine_images', 'created_at'),
+)
+
+def upgrade_schema(engine):
+    """
+    Bring tables that already exist in line with the current models.
+
+    PostgreSQL enum types are created and extended first, in autocommit
+    mode. The remaining steps run in one transaction; on PostgreSQL a
+    failure rolls them back and the error propagates to the caller.
+
+    Args:
+        engine: SQLAlchemy engine to upgrade
+    """
+    if engine.dialect.name == 'postgresql':
+        # ALTER TYPE ... ADD VALUE cannot run inside a transaction block before
+        # PostgreSQL 12, and later versions cannot use the value until it commits
+        with engine.execution_options(isolation_level='AUTOCOMMIT').connect() as conn:
+            _upgrade_pg_enum_types(conn)
+
+    with engine.begin() as conn:
+        tables = set(inspect(conn).get_table_names())
+
+        # Each step gets a fresh inspector, as reflection results are cached
+        _add_missing_columns(conn, inspect(conn), tables)
+        _drop_unique_keys(conn, inspect(conn), tables)
+        _add_unique_keys(conn, inspect(conn), tables)
+        if conn.dialect.name == 'postgresql':
+            # SQLite stores these types by affinity, so only PostgreSQL needs them
+            _upgrade_pg_types(conn, inspect(conn), tables)
+        _create_missing_indexes(conn)
+
+def _add_missing_columns(conn, inspector, tables):
+    """Add model columns that are missing from existing tables."""
+    preparer = conn.dialect.identifier_preparer
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable and column.server_default is None:
+                logger.error(f"Cannot add NOT NULL column {table.name}.{column.name} without a default")
+                continue
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(
+                f"ALTER TABLE {preparer.quote(table.name)} ADD COLUMN {preparer.quote(column.name)} {column_type}"
+            ))
+            logger.info(f"Added column {table.name}.{column.name}")
+
+def _has_unique(inspector, table, column):
+    """Whether a unique constraint or unique index covers exactly one column."""
+    keys = [constraint['column_names'] for constraint in inspector.get_unique_constraints(table)]
+    keys += [index['column_names'] for index in inspector.get_indexes(table) if index['unique']]
+    return [column] in keys
+
+def _drop_unique_keys(conn, inspector, tables):
+    """Drop unique keys that the models no longer declare."""
+    for table, column in _DROPPED_UNIQUE_KEYS:
+        if table not in tables:
+            continue
+        for index in inspector.get_indexes(table):
+            if index['unique'] and index['column_names'] == [column] and not index.get('duplicates_constraint'):
+                conn.execute(text(f"DROP INDEX IF EXISTS {index['name']}"))
+                logger.info(f"Dropped unique index {index['name']}")
+        for constraint in inspector.get_unique_constraints(table):
+            if constraint['column_names'] != [column]:
+                continue
+            if conn.dialect.name == 'sqlite':
+                # SQLite cannot drop a table constraint, so rebuild the table
+                _rebuild_sqlite_table(conn, inspector, table)
+            else:
+                conn.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT {constraint['name']}"))
+            logger.info(f"Dropped unique key on {table}.{column}")
+
+def _rebuild_sqlite_table(conn, inspector, table_name):
+    """Recreate a SQLite table from its model, keeping its rows."""
+    table = Base.metadata.tables[table_name]
+    columns = ", ".join(column.name for column in table.columns)
+    # Index names are global in SQLite, so clear them off the old table
+    for index in inspector.get_indexes(table_name):
+        conn.execute(text(f"DROP INDEX IF EXISTS {index['name']}"))
+    conn.execute(text(f"ALTER TABLE {table_name} RENAME TO _old_{table_name}"))
+    table.create(conn)
+    conn.execute(text(f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM _old_{table_name}"))
+    conn.execute(text(f"DROP TABLE _old_{table_name}"))
+
+def _add_unique_keys(conn, inspector, tables):
+    """Add the unique keys the upserts rely on, unless existing rows collide."""
+    for name in _DROPPED_INDEXES:
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+    for table, column, name in _UNIQUE_KEYS:
+        if table not in tables or _has_unique(inspector, table, column):
+            continue
+        duplicates = conn.execute(text(
+            f"SELECT {column} FROM {table} WHERE {column} IS NOT NULL "
+            f"GROUP BY {column} HAVING COUNT(*) > 1 LIMIT 5"
+        )).scalars().all()
+        if duplicates:
+            # Which copy to keep is for an operator to decide, not startup
+            logger.error(
+                f"Cannot add unique key {name}: {table} has duplicate {column} values "
+                f"(e.g. {duplicates}). Remove the duplicates and restart; upserts into "
+                f"{table} fail until then."
+            )
+            continue
+        conn.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS {name} ON {table} ({column})"))
+        logger.info(f"Added unique index {name}")
+
+def _upgrade_pg_enum_types(conn):
+    """Create the PostgreSQL enum types, adding values introduced since they were created."""
+    for _, _, enum_name, values in _PG_ENUM_COLUMNS:
+        existing = conn.execute(
+            text("SELECT e.enumlabel FROM pg_enum e JOIN pg_type t ON t.oid = e.enumtypid WHERE t.typname = :name"),
+            {'name': enum_name}
+        ).scalars().all()
+        if not existing:
+            postgresql.ENUM(*values, name=enum_name).create(conn, checkfirst=True)
+            continue
+        for value in values:
+            if value not in existing:
+                conn.execute(text(f"ALTER TYPE {enum_name} ADD VALUE IF NOT EXISTS '{value}'"))
+                logger.info(f"Added value {value!r} to enum {enum_name}")
+
+def _upgrade_pg_types(conn, inspector, tables):
+    """Convert PostgreSQL columns to the types the models now declare."""
+    columns = {
+        table: {column['name']: column for column in inspector.get_columns(table)}
+        for table in tables
+    }
+
+    for table, column, enum_name, values in _PG_ENUM_COLUMNS:
+        info = columns.get(table, {}).get(column)
+        if info is None or isinstance(info['type'], Enum):
+            continue
+        # Legacy strings are matched case- and whitespace-insensitively
+        legacy = f"lower(trim({column}))"
+        unknown = conn.execute(
+            text(f"SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL "
+                 f"AND {legacy} NOT IN :values LIMIT 10").bindparams(bindparam('values', expanding=True)),
+            {'values': list(values)}
+        ).scalars().all()
+        if unknown:
+            logger.error(
+                f"Cannot convert {table}.{column} to enum {enum_name}: values {unknown} are not "
+                f"among {list(values)}. Update or remove those rows and restart; the column "
+                f"stays a string column until then."
+            )
+            continue
+        conn.execute(text(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {enum_name} USING {legacy}::{enum_name}"
+        ))
+        logger.info(f"Converted {table}.{column} to enum {enum_name}")
+
+    for table, column in _PG_SMALLINT_COLUMNS:
+        info = columns.get(table, {}).get(column)
+        if info is not None and not isinstance(info['type'], SmallInteger):
+            conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE SMALLINT"))
+            logger.info(f"Converted {table}.{column} to SMALLINT")
+
+    for table, column in _PG_JSONB_COLUMNS:
+        info = columns.get(table, {}).get(column)
+        if info is not None and not isinstance(info['type'], postgresql.JSONB):
+            conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb"))
+            logger.info(f"Converted {table}.{column} to JSONB")
+
+    for table, column in _PG_TIMESTAMPTZ_COLUMNS:
+        info = columns.get(table, {}).get(column)
+        if info is None:
+            continue
+        if isinstance(info['type'], DateTime) and not info['type'].timezone:
+            # Old values were written with datetime.utcnow()
+            conn.execute(text(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE TIMESTAMP WITH TIME ZONE "
+                f"USING {column} AT TIME ZONE 'UTC'"
+            ))
+            logger.info(f"Converted {table}.{column} to TIMESTAMP WITH TIME ZONE")
+        if info['default'] is None:
+            conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT now()"))
+
+def _create_missing_indexes(conn):
+    """Create model indexes missing from tables that predate them."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.dialect_kwargs.get('postgresql_using') and conn.dialect.name != 'postgresql':
+                continue
+            index.create(conn, checkfirst=True)
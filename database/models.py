@@ -2,11 +2,18 @@
 Database models for the GAIA-∞ Climate Intelligence Platform.
 """
 
-import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, SmallInteger, String, Float, DateTime, Boolean, Text, ForeignKey, JSON, Index, Enum, LargeBinary, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from database.connection import Base
 
+# Closed value sets stored as enums instead of free-form strings
+CLIMATE_DATA_TYPES = ('temperature', 'co2', 'sea_level', 'ice_extent')
+ALERT_TYPES = ('drought', 'flood', 'wildfire', 'extreme_weather', 'sea_level')
+
+# Binary JSONB on PostgreSQL (parsed once, GIN-indexable); plain JSON elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 class User(Base):
     """User model for storing user data"""
     __tablename__ = 'users'
@@ -16,7 +23,7 @@ class User(Base):
     username = Column(String(50), unique=True, nullable=False)
     email = Column(String(120), unique=True, nullable=False)
     password_hash = Column(String(256), nullable=False)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     last_login = Column(DateTime)
     is_active = Column(Boolean, default=True)
     role = Column(String(20), default='user')
@@ -34,13 +41,13 @@ class UserPreference(Base):
     __table_args__ = {'extend_existing': True}
     
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), unique=True, nullable=False)
     theme = Column(String(20), default='light')
     default_map_view = Column(String(50), default='earth')
     temperature_unit = Column(String(10), default='celsius')
     notification_enabled = Column(Boolean, default=True)
     advanced_mode = Column(Boolean, default=False)
-    custom_settings = Column(JSON)
+    custom_settings = Column(JSONType)
     
     # Relationships
     user = relationship("User", back_populates="preferences")
@@ -59,7 +66,7 @@ class SavedLocation(Base):
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
     description = Column(Text)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     user = relationship("User", back_populates="saved_locations")
@@ -70,10 +77,15 @@ class SavedLocation(Base):
 class ClimateData(Base):
     """Climate data model for storing climate measurements and predictions"""
     __tablename__ = 'climate_data'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index('ix_climate_type_time', 'data_type', 'timestamp'),
+        Index('ix_climate_pred', 'is_prediction', 'data_type'),
+        Index('ix_climate_meta_gin', 'meta_data', postgresql_using='gin').ddl_if(dialect='postgresql'),
+        {'extend_existing': True}
+    )
     
     id = Column(Integer, primary_key=True)
-    data_type = Column(String(50), nullable=False)  # temperature, co2, sea_level, ice_extent
+    data_type = Column(Enum(*CLIMATE_DATA_TYPES, name='climate_data_type'), nullable=False)
     timestamp = Column(DateTime, nullable=False)
     value = Column(Float, nullable=False)
     latitude = Column(Float)
@@ -81,33 +93,59 @@ class ClimateData(Base):
     source = Column(String(100))
     is_prediction = Column(Boolean, default=False)
     prediction_model = Column(String(100))
-    meta_data = Column(JSON)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    meta_data = Column(JSONType)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     def __repr__(self):
         return f"<ClimateData {self.data_type} @ {self.timestamp}>"
 
+# Covering index for get_climate_data: filters on type/prediction, returns rows
+# newest-first and serves value/location straight from the index on PostgreSQL
+Index(
+    'ix_climate_tri',
+    ClimateData.data_type,
+    ClimateData.is_prediction,
+    ClimateData.timestamp.desc(),
+    postgresql_include=['value', 'latitude', 'longitude']
+)
+
 class Alert(Base):
     """Environmental alerts model"""
     __tablename__ = 'alerts'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index('ix_alerts_active_exp', 'is_active', 'expires_at'),
+        Index('ix_alerts_type_region', 'alert_type', 'region'),
+        # Seeded alerts are upserted on seed_key; user alerts leave it NULL
+        UniqueConstraint('seed_key', name='uq_alerts_seed_key'),
+        {'extend_existing': True}
+    )
     
     id = Column(Integer, primary_key=True)
-    alert_type = Column(String(50), nullable=False)  # drought, flood, wildfire, extreme_weather
-    severity = Column(Integer, nullable=False)  # 1-5, with 5 being most severe
+    alert_type = Column(Enum(*ALERT_TYPES, name='alert_type'), nullable=False)
+    severity = Column(SmallInteger, nullable=False)  # 1-5, with 5 being most severe
     region = Column(String(100), nullable=False)
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
     title = Column(String(200), nullable=False)
     description = Column(Text)
-    issued_at = Column(DateTime, default=datetime.datetime.utcnow)
+    issued_at = Column(DateTime(timezone=True), server_default=func.now())
     expires_at = Column(DateTime)
     is_active = Column(Boolean, default=True)
     source = Column(String(100))
+    seed_key = Column(String(100))
     
     def __repr__(self):
         return f"<Alert {self.alert_type} in {self.region}>"
 
+# Partial index matching get_active_alerts' ORDER BY, limited to active alerts
+Index(
+    'ix_alert_active',
+    Alert.severity.desc(),
+    Alert.issued_at.desc(),
+    postgresql_where=Alert.is_active.is_(True),
+    postgresql_include=['alert_type', 'region']
+)
+
 class SimulationResult(Base):
     """Model for storing climate simulation results"""
     __tablename__ = 'simulation_results'
@@ -116,10 +154,11 @@ class SimulationResult(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)
     scenario = Column(String(50), nullable=False)
-    parameters = Column(JSON)
-    results = Column(JSON)
+    parameters = Column(JSONType)
+    results = Column(JSONType)
+    results_blob = Column(LargeBinary)  # Blosc-compressed arrays referenced from results
     created_by = Column(Integer, ForeignKey('users.id'))
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     description = Column(Text)
     
     def __repr__(self):
@@ -128,16 +167,41 @@ class SimulationResult(Base):
 class EarthEngineImage(Base):
     """Model for storing Earth Engine image references and metadata"""
     __tablename__ = 'earth_engine_images'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        UniqueConstraint('dataset_id', name='uq_ee_dataset'),
+        {'extend_existing': True}
+    )
     
     id = Column(Integer, primary_key=True)
     dataset_id = Column(String(200), nullable=False)
     display_name = Column(String(200), nullable=False)
     description = Column(Text)
     date = Column(DateTime)
-    image_properties = Column(JSON)
-    visualization_params = Column(JSON)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    image_properties = Column(JSONType)
+    visualization_params = Column(JSONType)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     def __repr__(self):
-        return f"<EarthEngineImage {self.display_name}>"
\ No newline at end of file
+        return f"<EarthEngineImage {self.display_name}>"
+
+class Story(Base):
+    """Model for AI-generated climate stories, scoped to the session that created them"""
+    __tablename__ = 'stories'
+    __table_args__ = {'extend_existing': True}
+    
+    id = Column(Integer, primary_key=True)
+    session_id = Column(String(64), nullable=False)
+    title = Column(String(200), nullable=False)
+    content = Column(Text, nullable=False)
+    themes = Column(JSONType)
+    parameters = Column(JSONType)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<Story {self.title}>"
+
+# Newest-first pages of one session's stories
+Index('ix_story_session', Story.session_id, Story.created_at.desc())
+
+# Age-based cleanup of stories across all sessions
+Index('ix_story_created', Story.created_at)
@@ -5,355 +5,638 @@ This module provides functions for interacting with the database,
 including storing and retrieving climate data, alerts, simulation results, etc.
 """
 
+import io
+import csv
 import logging
+import threading
+import blosc
+import orjson
 import numpy as np
-from datetime import datetime
+from datetime import datetime, timedelta
+from cachetools import TTLCache, cached
+from sqlalchemy import delete, func, insert, select
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
-from database.connection import get_db_session, close_db_session, init_db
+from database.connection import session_scope, init_db
 from database.models import (
     User, UserPreference, SavedLocation, ClimateData, 
-    Alert, SimulationResult, EarthEngineImage
+    Alert, SimulationResult, EarthEngineImage, Story
 )
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Short-lived caches for read-mostly lookups hit on every page render;
+# cleared whenever this process writes to the underlying table
+_ALERTS_CACHE = TTLCache(maxsize=128, ttl=30)
+_EE_IMAGES_CACHE = TTLCache(maxsize=2, ttl=30)
+_CACHE_LOCK = threading.Lock()
+
+def clear_read_caches():
+    """Drop the cached alert and Earth Engine image lookups, e.g. after seeding."""
+    with _CACHE_LOCK:
+        _ALERTS_CACHE.clear()
+        _EE_IMAGES_CACHE.clear()
+
+# Dialect-specific INSERTs that support ON CONFLICT clauses
+_CONFLICT_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+def _conflict_insert(session):
+    """Return the ON CONFLICT capable insert() for the session's dialect, if any."""
+    return _CONFLICT_INSERTS.get(session.get_bind().dialect.name)
+
 def create_user(username, email, password_hash, role='user'):
-    """Create a new user in the database."""
-    session = get_db_session()
+    """Create a new user in the database, ignoring existing usernames/emails."""
+    values = dict(
+        username=username,
+        email=email,
+        password_hash=password_hash,
+        role=role
+    )
     try:
-        existing_user = session.query(User).filter(
-            (User.username == username) | (User.email == email)
-        ).first()
-
-        if existing_user:
-            logger.warning(f"User with username '{username}' or email '{email}' already exists")
-            return False
-
-        user = User(
-            username=username,
-            email=email,
-            password_hash=password_hash,
-            role=role,
-            created_at=datetime.utcnow()
-        )
-
-        session.add(user)
-        session.commit()
-        logger.info(f"User '{username}' created successfully")
+        with session_scope() as session:
+            conflict_insert = _conflict_insert(session)
+            if conflict_insert is not None:
+                # Single round-trip: the unique constraints on username/email reject duplicates
+                stmt = conflict_insert(User).values(**values).on_conflict_do_nothing().returning(User.id)
+                created = session.execute(stmt).first() is not None
+            else:
+                created = session.scalars(select(User.id).where(
+                    (User.username == username) | (User.email == email)
+                )).first() is None
+                if created:
+                    session.add(User(**values))
+    except SQLAlchemyError as e:
+        logger.error(f"Error creating user: {str(e)}")
+        return False
+
+    if not created:
+        logger.warning(f"User with username '{username}' or email '{email}' already exists")
+        return False
+
+    logger.info(f"User '{username}' created successfully")
+    return True
+
+def _insert_many(model, records, action):
+    """Insert records of a model as one multi-row INSERT in its own transaction."""
+    if not records:
         return True
 
+    try:
+        with session_scope() as session:
+            session.execute(insert(model), records)
+        return True
     except SQLAlchemyError as e:
-        session.rollback()
-        logger.error(f"Error creating user: {str(e)}")
+        logger.error(f"Error {action}: {str(e)}")
         return False
-    finally:
-        close_db_session(session)
+
+def _to_float(value):
+    """Cast to a Python float (numpy scalars included), keeping None."""
+    return None if value is None else float(value)
+
+def _to_int(value):
+    """Cast to a Python int (numpy scalars included), keeping None."""
+    return None if value is None else int(value)
+
+def _coerce_numbers(record, float_keys=(), int_keys=()):
+    """Copy a record, casting the given keys to Python numbers without type checks."""
+    record = dict(record)
+    for key in float_keys:
+        record[key] = _to_float(record.get(key))
+    for key in int_keys:
+        record[key] = _to_int(record.get(key))
+    return record
+
+def store_climate_data_many(records):
+    """Store many climate data records, each a dict of store_climate_data arguments."""
+    records = [_coerce_numbers(record, float_keys=('value', 'latitude', 'longitude'))
+               for record in records]
+    return _insert_many(ClimateData, records, "storing climate data")
 
 def store_climate_data(data_type, timestamp, value, source=None, 
                       latitude=None, longitude=None, is_prediction=False, 
                       prediction_model=None, meta_data=None):
     """Store climate data in the database."""
-    session = get_db_session()
+    return store_climate_data_many([dict(
+        data_type=data_type,
+        timestamp=timestamp,
+        value=value,
+        latitude=latitude,
+        longitude=longitude,
+        source=source,
+        is_prediction=is_prediction,
+        prediction_model=prediction_model,
+        meta_data=meta_data
+    )])
+
+# Batches at least this large are worth the COPY setup cost
+_COPY_MIN_ROWS = 100
+
+def store_climate_data_bulk(rows):
+    """Store many climate data rows in a single transaction.
+
+    Args:
+        rows: List of dicts keyed by ClimateData column names, all with the same keys
+
+    Returns:
+        True on success, False otherwise
+    """
+    # Cast numpy scalars once up-front so both load paths see plain floats
+    rows = [_coerce_numbers(row, float_keys=('value', 'latitude', 'longitude'))
+            for row in rows]
     try:
-        # Convert numpy types to Python native types
-        if isinstance(value, (np.number, float)):
-            value = float(value)
-        if isinstance(latitude, (np.number, float)):
-            latitude = float(latitude)
-        if isinstance(longitude, (np.number, float)):
-            longitude = float(longitude)
-
-        climate_data = ClimateData(
-            data_type=data_type,
-            timestamp=timestamp,
-            value=value,
-            latitude=latitude,
-            longitude=longitude,
-            source=source,
-            is_prediction=is_prediction,
-            prediction_model=prediction_model,
-            meta_data=meta_data,
-            created_at=datetime.utcnow()
-        )
-
-        session.add(climate_data)
-        session.commit()
+        with session_scope() as session:
+            if len(rows) >= _COPY_MIN_ROWS:
+                copy_insert(session, ClimateData, rows)
+            else:
+                bulk_insert(session, ClimateData, rows)
         return True
-
     except SQLAlchemyError as e:
-        session.rollback()
-        logger.error(f"Error storing climate data: {str(e)}")
+        logger.error(f"Error storing climate data batch: {str(e)}")
         return False
-    finally:
-        close_db_session(session)
+
+def bulk_insert(session, model, rows, batch_size=5000):
+    """Insert many rows of a model in batches of Core executemany INSERTs.
+
+    Goes through the model's Table rather than the ORM, so no instances,
+    identity-map entries or unit-of-work bookkeeping are created. The caller
+    owns the transaction and is responsible for committing.
+    """
+    table = model.__table__
+    for start in range(0, len(rows), batch_size):
+        session.execute(table.insert(), rows[start:start + batch_size])
+
+def copy_insert(session, model, rows):
+    """Stream rows into the model's table with PostgreSQL COPY FROM STDIN.
+
+    JSON values are pre-serialized and None becomes SQL NULL. Other dialects
+    fall back to bulk_insert. The caller owns the transaction.
+    """
+    if not rows or session.get_bind().dialect.name != "postgresql":
+        bulk_insert(session, model, rows)
+        return
+
+    columns = list(rows[0])
+    encoded = {}  # JSON text per shared dict/list object, serialized once
+
+    def _csv_value(value):
+        if value is None:
+            return ""
+        if isinstance(value, (dict, list)):
+            if id(value) not in encoded:
+                encoded[id(value)] = orjson.dumps(value).decode()
+            return encoded[id(value)]
+        return value
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_csv_value(row[column]) for column in columns])
+    buffer.seek(0)
+
+    sql = f"COPY {model.__tablename__} ({', '.join(columns)}) FROM STDIN WITH CSV"
+    with session.connection().connection.cursor() as cursor:
+        cursor.copy_expert(sql, buffer)
+
+def upsert(session, model, rows, index_elements, update_columns):
+    """Insert rows, updating update_columns where index_elements already exist.
+
+    Uses a single INSERT ... ON CONFLICT DO UPDATE where the dialect supports
+    it and falls back to a plain bulk insert elsewhere. The caller commits.
+    """
+    conflict_insert = _conflict_insert(session)
+    if conflict_insert is None:
+        bulk_insert(session, model, rows)
+        return
+
+    stmt = conflict_insert(model).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={column: stmt.excluded[column] for column in update_columns}
+    )
+    session.execute(stmt)
+
+# Columns read by the climate data consumers; fetched as plain Row tuples
+_CLIMATE_DATA_COLUMNS = (
+    ClimateData.id, ClimateData.timestamp, ClimateData.value, ClimateData.latitude,
+    ClimateData.longitude, ClimateData.source, ClimateData.is_prediction
+)
+
+def _filter_climate_data(stmt, data_type, start_date, end_date, is_prediction, limit):
+    """Apply the shared climate data filters, ordering and limit to a select()."""
+    if data_type:
+        stmt = stmt.where(ClimateData.data_type == data_type)
+    if start_date:
+        stmt = stmt.where(ClimateData.timestamp >= start_date)
+    if end_date:
+        stmt = stmt.where(ClimateData.timestamp <= end_date)
+    if is_prediction is not None:
+        stmt = stmt.where(ClimateData.is_prediction == is_prediction)
+
+    return stmt.order_by(ClimateData.timestamp).limit(limit)
 
 def get_climate_data(data_type=None, start_date=None, end_date=None, 
-                    is_prediction=None, limit=1000):
-    """Get climate data from the database."""
+                    is_prediction=None, limit=1000, full_objects=False):
+    """
+    Get climate data from the database.
+    
+    Rows are lightweight named tuples of _CLIMATE_DATA_COLUMNS streamed in
+    batches; pass full_objects=True for ClimateData ORM instances instead.
+    """
     if not init_db():
         logger.error("Database not properly initialized")
         return []
 
-    session = get_db_session()
+    stmt = select(ClimateData) if full_objects else select(*_CLIMATE_DATA_COLUMNS)
+    stmt = _filter_climate_data(stmt, data_type, start_date, end_date, is_prediction, limit)
     try:
-        query = session.query(ClimateData)
-
-        if data_type:
-            query = query.filter(ClimateData.data_type == data_type)
-        if start_date:
-            query = query.filter(ClimateData.timestamp >= start_date)
-        if end_date:
-            query = query.filter(ClimateData.timestamp <= end_date)
-        if is_prediction is not None:
-            query = query.filter(ClimateData.is_prediction == is_prediction)
-
-        return query.order_by(ClimateData.timestamp).limit(limit).all()
-
+        with session_scope() as session:
+            if full_objects:
+                return session.scalars(stmt).all()
+            return list(session.execute(stmt).yield_per(1000))
     except SQLAlchemyError as e:
         logger.error(f"Error retrieving climate data: {str(e)}")
         return []
-    finally:
-        close_db_session(session)
+
+def get_climate_data_arrays(data_type=None, start_date=None, end_date=None,
+                            is_prediction=None, limit=1000):
+    """
+    Get climate data as one NumPy array per column rather than one object per row.
+    
+    Returns:
+        Dict with 'timestamp' (datetime64[s]), 'value', 'latitude' and
+        'longitude' (float64, NaN where missing) arrays of equal length
+    """
+    if not init_db():
+        logger.error("Database not properly initialized")
+        rows = []
+    else:
+        stmt = select(ClimateData.timestamp, ClimateData.value,
+                      ClimateData.latitude, ClimateData.longitude)
+        stmt = _filter_climate_data(stmt, data_type, start_date, end_date, is_prediction, limit)
+        try:
+            with session_scope() as session:
+                rows = session.execute(stmt).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error retrieving climate data: {str(e)}")
+            rows = []
+
+    timestamps, values, latitudes, longitudes = zip(*rows) if rows else ((), (), (), ())
+    return {
+        'timestamp': np.array(timestamps, dtype='datetime64[s]'),
+        'value': np.fromiter(values, dtype=np.float64, count=len(rows)),
+        'latitude': np.array(latitudes, dtype=np.float64),
+        'longitude': np.array(longitudes, dtype=np.float64)
+    }
+
+def create_alert_many(records):
+    """Create many environmental alerts, each a dict of create_alert arguments."""
+    records = [_coerce_numbers({'is_active': True, **record},
+                               float_keys=('latitude', 'longitude'), int_keys=('severity',))
+               for record in records]
+    created = _insert_many(Alert, records, "creating alert")
+    if created:
+        with _CACHE_LOCK:
+            _ALERTS_CACHE.clear()
+    return created
 
 def create_alert(alert_type, severity, region, latitude, longitude, 
                 title, description=None, expires_at=None, source=None):
     """Create a new environmental alert."""
-    session = get_db_session()
-    try:
-        if isinstance(severity, np.number):
-            severity = int(severity)
-        if isinstance(latitude, (np.number, float)):
-            latitude = float(latitude)
-        if isinstance(longitude, (np.number, float)):
-            longitude = float(longitude)
-
-        alert = Alert(
-            alert_type=alert_type,
-            severity=severity,
-            region=region,
-            latitude=latitude,
-            longitude=longitude,
-            title=title,
-            description=description,
-            issued_at=datetime.utcnow(),
-            expires_at=expires_at,
-            is_active=True,
-            source=source
-        )
-
-        session.add(alert)
-        session.commit()
-        return True
-
-    except SQLAlchemyError as e:
-        session.rollback()
-        logger.error(f"Error creating alert: {str(e)}")
-        return False
-    finally:
-        close_db_session(session)
+    return create_alert_many([dict(
+        alert_type=alert_type,
+        severity=severity,
+        region=region,
+        latitude=latitude,
+        longitude=longitude,
+        title=title,
+        description=description,
+        expires_at=expires_at,
+        source=source
+    )])
+
+# Alert columns returned by get_active_alerts as immutable Row tuples, which
+# are safe to share from the cache across Streamlit session threads
+_ALERT_COLUMNS = (
+    Alert.id, Alert.alert_type, Alert.severity, Alert.region, Alert.latitude,
+    Alert.longitude, Alert.title, Alert.description, Alert.issued_at,
+    Alert.expires_at, Alert.is_active, Alert.source
+)
 
-def get_active_alerts(alert_type=None, region=None, min_severity=None):
-    """Get active alerts from the database."""
-    session = get_db_session()
-    try:
-        query = session.query(Alert).filter(Alert.is_active == True)
+@cached(_ALERTS_CACHE, lock=_CACHE_LOCK)
+def _query_active_alerts(alert_type, region, min_severity):
+    # Database errors propagate so that failures are never cached
+    stmt = select(*_ALERT_COLUMNS).where(Alert.is_active == True)
 
-        if alert_type:
-            query = query.filter(Alert.alert_type == alert_type)
-        if region:
-            query = query.filter(Alert.region == region)
-        if min_severity:
-            query = query.filter(Alert.severity >= min_severity)
+    if alert_type:
+        stmt = stmt.where(Alert.alert_type == alert_type)
+    if region:
+        stmt = stmt.where(Alert.region == region)
+    if min_severity:
+        stmt = stmt.where(Alert.severity >= min_severity)
 
-        return query.order_by(Alert.severity.desc(), Alert.issued_at.desc()).all()
+    with session_scope() as session:
+        return tuple(session.execute(stmt.order_by(Alert.severity.desc(), Alert.issued_at.desc())))
 
+def get_active_alerts(alert_type=None, region=None, min_severity=None):
+    """Get active alerts from the database as Row tuples with attribute access."""
+    try:
+        return list(_query_active_alerts(alert_type, region, min_severity))
     except SQLAlchemyError as e:
         logger.error(f"Error retrieving alerts: {str(e)}")
         return []
-    finally:
-        close_db_session(session)
+
+def store_simulation_result_many(records):
+    """Store many simulation results, each a dict of store_simulation_result arguments."""
+    # Arrays in results move to results_blob; remaining NumPy values in
+    # parameters/results are encoded directly by the engine's orjson serializer
+    records = [_coerce_numbers(record, int_keys=('created_by',)) for record in records]
+    for record in records:
+        record['results'], record['results_blob'] = pack_simulation_results(record.get('results'))
+    return _insert_many(SimulationResult, records, "storing simulation result")
 
 def store_simulation_result(name, scenario, parameters, results, description=None, created_by=None):
     """Store a climate simulation result."""
-    session = get_db_session()
-    try:
-        parameters = _convert_numpy_to_python_types(parameters) if parameters else None
-        results = _convert_numpy_to_python_types(results) if results else None
-        if isinstance(created_by, np.number):
-            created_by = int(created_by)
-
-        simulation = SimulationResult(
-            name=name,
-            scenario=scenario,
-            parameters=parameters,
-            results=results,
-            created_by=created_by,
-            created_at=datetime.utcnow(),
-            description=description
-        )
-
-        session.add(simulation)
-        session.commit()
-        return True
-
-    except SQLAlchemyError as e:
-        session.rollback()
-        logger.error(f"Error storing simulation result: {str(e)}")
-        return False
-    finally:
-        close_db_session(session)
-
-def _convert_numpy_to_python_types(obj):
-    """Convert numpy types to Python native types in a nested structure."""
-    if isinstance(obj, dict):
-        return {k: _convert_numpy_to_python_types(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [_convert_numpy_to_python_types(item) for item in obj]
-    elif isinstance(obj, np.number):
-        return int(obj) if isinstance(obj, (np.int32, np.int64)) else float(obj)
-    elif isinstance(obj, np.ndarray):
-        return _convert_numpy_to_python_types(obj.tolist())
-    elif isinstance(obj, np.bool_):
-        return bool(obj)
-    return obj
+    return store_simulation_result_many([dict(
+        name=name,
+        scenario=scenario,
+        parameters=parameters,
+        results=results,
+        created_by=created_by,
+        description=description
+    )])
+
+# Placeholder key for an array leaf moved into SimulationResult.results_blob
+_BLOSC_REF = "__blosc_ref__"
+
+def pack_simulation_results(results):
+    """
+    Move the ndarray leaves of a results structure into a Blosc-compressed blob.
+    
+    Returns:
+        Tuple of the JSON-safe results, with each array replaced by
+        {"__blosc_ref__": name}, and the compressed array archive (None if
+        there were no arrays)
+    """
+    arrays = {}
+
+    def _extract(value):
+        if isinstance(value, np.ndarray):
+            name = f"arr_{len(arrays)}"
+            arrays[name] = value
+            return {_BLOSC_REF: name}
+        if isinstance(value, dict):
+            return {key: _extract(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [_extract(item) for item in value]
+        return value
+
+    results = _extract(results)
+    if not arrays:
+        return results, None
+
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    # The npz stream mixes headers and arrays of any dtype, so no byte-shuffle typesize
+    return results, blosc.compress(buffer.getvalue(), cname='lz4', clevel=5)
+
+def unpack_simulation_results(results, blob):
+    """Rebuild a results structure, restoring the arrays referenced into its blob."""
+    if blob is None:
+        return results
+
+    with np.load(io.BytesIO(blosc.decompress(blob)), allow_pickle=False) as archive:
+        arrays = {name: archive[name] for name in archive.files}
+
+    def _restore(value):
+        if isinstance(value, dict):
+            if set(value) == {_BLOSC_REF}:
+                return arrays[value[_BLOSC_REF]]
+            return {key: _restore(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [_restore(item) for item in value]
+        return value
+
+    return _restore(results)
 
 def get_simulation_results(scenario=None, created_by=None):
-    """Get simulation results from the database."""
-    session = get_db_session()
-    try:
-        query = session.query(SimulationResult)
-
-        if scenario:
-            query = query.filter(SimulationResult.scenario == scenario)
-        if created_by:
-            query = query.filter(SimulationResult.created_by == created_by)
+    """Get simulation results from the database, with arrays restored into results."""
+    stmt = select(SimulationResult)
 
-        return query.order_by(SimulationResult.created_at.desc()).all()
+    if scenario:
+        stmt = stmt.where(SimulationResult.scenario == scenario)
+    if created_by:
+        stmt = stmt.where(SimulationResult.created_by == created_by)
 
+    try:
+        with session_scope() as session:
+            rows = session.scalars(stmt.order_by(SimulationResult.created_at.desc())).all()
+            for row in rows:
+                # Committed value, so the unpacked arrays are never flushed back
+                set_committed_value(row, 'results', unpack_simulation_results(row.results, row.results_blob))
+            return rows
     except SQLAlchemyError as e:
         logger.error(f"Error retrieving simulation results: {str(e)}")
         return []
-    finally:
-        close_db_session(session)
+
+def store_earth_engine_image_many(records):
+    """Store metadata for many Earth Engine images, each a dict of store_earth_engine_image arguments."""
+    # JSON payloads may hold NumPy values; the engine's orjson serializer encodes them directly
+    stored = _insert_many(EarthEngineImage, records, "storing Earth Engine image")
+    if stored:
+        with _CACHE_LOCK:
+            _EE_IMAGES_CACHE.clear()
+    return stored
 
 def store_earth_engine_image(dataset_id, display_name, description=None, 
                            date=None, image_properties=None, visualization_params=None):
     """Store Earth Engine image metadata."""
-    session = get_db_session()
-    try:
-        image_properties = _convert_numpy_to_python_types(image_properties) if image_properties else None
-        visualization_params = _convert_numpy_to_python_types(visualization_params) if visualization_params else None
-
-        image = EarthEngineImage(
-            dataset_id=dataset_id,
-            display_name=display_name,
-            description=description,
-            date=date,
-            image_properties=image_properties,
-            visualization_params=visualization_params,
-            created_at=datetime.utcnow()
-        )
-
-        session.add(image)
-        session.commit()
-        return True
-
-    except SQLAlchemyError as e:
-        session.rollback()
-        logger.error(f"Error storing Earth Engine image: {str(e)}")
-        return False
-    finally:
-        close_db_session(session)
-
-def get_earth_engine_images():
-    """Get Earth Engine image metadata from the database."""
-    session = get_db_session()
+    return store_earth_engine_image_many([dict(
+        dataset_id=dataset_id,
+        display_name=display_name,
+        description=description,
+        date=date,
+        image_properties=image_properties,
+        visualization_params=visualization_params
+    )])
+
+# Earth Engine image columns; the JSON payload columns are only fetched on request
+_EE_IMAGE_COLUMNS = (
+    EarthEngineImage.id, EarthEngineImage.dataset_id, EarthEngineImage.display_name,
+    EarthEngineImage.description, EarthEngineImage.date, EarthEngineImage.created_at
+)
+_EE_PAYLOAD_COLUMNS = (EarthEngineImage.image_properties, EarthEngineImage.visualization_params)
+
+@cached(_EE_IMAGES_CACHE, lock=_CACHE_LOCK)
+def _query_earth_engine_images(include_payloads):
+    # Database errors propagate so that failures are never cached
+    columns = _EE_IMAGE_COLUMNS + _EE_PAYLOAD_COLUMNS if include_payloads else _EE_IMAGE_COLUMNS
+    stmt = select(*columns).order_by(EarthEngineImage.display_name)
+    with session_scope() as session:
+        return tuple(session.execute(stmt))
+
+def get_earth_engine_images(include_payloads=False):
+    """
+    Get Earth Engine image metadata from the database as Row tuples.
+    
+    The image_properties/visualization_params JSON columns are only included
+    when include_payloads is True.
+    """
     try:
-        return session.query(EarthEngineImage).order_by(EarthEngineImage.display_name).all()
-
+        return list(_query_earth_engine_images(include_payloads))
     except SQLAlchemyError as e:
         logger.error(f"Error retrieving Earth Engine images: {str(e)}")
         return []
-    finally:
-        close_db_session(session)
+
+def save_user_location_many(records):
+    """Save many user locations, each a dict of save_user_location arguments."""
+    records = [_coerce_numbers(record, float_keys=('latitude', 'longitude'), int_keys=('user_id',))
+               for record in records]
+    return _insert_many(SavedLocation, records, "saving user location")
 
 def save_user_location(user_id, name, latitude, longitude, description=None):
     """Save a location for a user."""
-    session = get_db_session()
-    try:
-        if isinstance(user_id, np.number):
-            user_id = int(user_id)
-        if isinstance(latitude, (np.number, float)):
-            latitude = float(latitude)
-        if isinstance(longitude, (np.number, float)):
-            longitude = float(longitude)
-
-        location = SavedLocation(
-            user_id=user_id,
-            name=name,
-            latitude=latitude,
-            longitude=longitude,
-            description=description,
-            created_at=datetime.utcnow()
-        )
-
-        session.add(location)
-        session.commit()
-        return True
-
-    except SQLAlchemyError as e:
-        session.rollback()
-        logger.error(f"Error saving user location: {str(e)}")
-        return False
-    finally:
-        close_db_session(session)
+    return save_user_location_many([dict(
+        user_id=user_id,
+        name=name,
+        latitude=latitude,
+        longitude=longitude,
+        description=description
+    )])
 
 def get_user_saved_locations(user_id):
-    """Get saved locations for a user."""
-    session = get_db_session()
+    """Get saved locations for a user, loading only the columns needed to list them."""
+    stmt = select(SavedLocation).where(SavedLocation.user_id == user_id).options(
+        load_only(SavedLocation.id, SavedLocation.name, SavedLocation.latitude,
+                  SavedLocation.longitude, raiseload=True)
+    )
     try:
-        return session.query(SavedLocation).filter(SavedLocation.user_id == user_id).all()
-
+        with session_scope() as session:
+            return session.scalars(stmt).all()
     except SQLAlchemyError as e:
         logger.error(f"Error retrieving user saved locations: {str(e)}")
         return []
-    finally:
-        close_db_session(session)
 
 def update_user_preferences(user_id, theme=None, default_map_view=None, 
                           temperature_unit=None, notification_enabled=None, 
                           advanced_mode=None, custom_settings=None):
     """Update user preferences."""
-    session = get_db_session()
+    changes = {
+        key: value for key, value in dict(
+            theme=theme,
+            default_map_view=default_map_view,
+            temperature_unit=temperature_unit,
+            notification_enabled=notification_enabled,
+            advanced_mode=advanced_mode,
+            custom_settings=custom_settings
+        ).items() if value is not None
+    }
     try:
-        preferences = session.query(UserPreference).filter(UserPreference.user_id == user_id).first()
-
-        if not preferences:
-            preferences = UserPreference(user_id=user_id)
-            session.add(preferences)
-
-        if theme is not None:
-            preferences.theme = theme
-        if default_map_view is not None:
-            preferences.default_map_view = default_map_view
-        if temperature_unit is not None:
-            preferences.temperature_unit = temperature_unit
-        if notification_enabled is not None:
-            preferences.notification_enabled = notification_enabled
-        if advanced_mode is not None:
-            preferences.advanced_mode = advanced_mode
-        if custom_settings is not None:
-            preferences.custom_settings = custom_settings
-
-        session.commit()
+        with session_scope() as session:
+            conflict_insert = _conflict_insert(session)
+            if conflict_insert is not None:
+                # Single round-trip create-or-update keyed on the unique user_id
+                stmt = conflict_insert(UserPreference).values(user_id=user_id, **changes)
+                if changes:
+                    stmt = stmt.on_conflict_do_update(index_elements=['user_id'], set_=changes)
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=['user_id'])
+                session.execute(stmt)
+            else:
+                preferences = session.scalars(
+                    select(UserPreference).where(UserPreference.user_id == user_id)
+                ).first()
+                if not preferences:
+                    preferences = UserPreference(user_id=user_id)
+                    session.add(preferences)
+                for key, value in changes.items():
+                    setattr(preferences, key, value)
         return True
-
     except SQLAlchemyError as e:
-        session.rollback()
         logger.error(f"Error updating user preferences: {str(e)}")
         return False
-    finally:
-        close_db_session(session)
\ No newline at end of file
+
+# Stories are keyed by browser session, which nothing can reopen later,
+# so they are kept only for this many days
+STORY_RETENTION_DAYS = 30
+
+def save_stories(session_id, stories):
+    """
+    Save generated stories, each a storyteller story dict, for a session.
+
+    Stories of any session older than STORY_RETENTION_DAYS are deleted in
+    the same transaction, so the table does not grow without bound.
+    """
+    if not init_db():
+        logger.error("Database not properly initialized")
+        return False
+
+    records = [dict(
+        session_id=session_id,
+        title=story["title"],
+        content=story["content"],
+        themes=story["themes"],
+        parameters=story["parameters"],
+        created_at=datetime.fromisoformat(story["created_at"])
+    ) for story in stories]
+
+    # Story timestamps come from the storyteller's local datetime.now()
+    cutoff = datetime.now() - timedelta(days=STORY_RETENTION_DAYS)
+    try:
+        with session_scope() as session:
+            expired = session.execute(delete(Story).where(Story.created_at < cutoff)).rowcount
+            if records:
+                session.execute(insert(Story), records)
+        if expired:
+            logger.info(f"Deleted {expired} stories older than {STORY_RETENTION_DAYS} days")
+        return True
+    except SQLAlchemyError as e:
+        logger.error(f"Error saving stories: {str(e)}")
+        return False
+
+def get_stories(session_id, limit=10, offset=0):
+    """Get one page of a session's stories, newest first, as storyteller story dicts."""
+    if not init_db():
+        logger.error("Database not properly initialized")
+        return []
+
+    stmt = (
+        select(Story.title, Story.content, Story.themes, Story.parameters, Story.created_at)
+        .where(Story.session_id == session_id)
+        .order_by(Story.created_at.desc(), Story.id.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    try:
+        with session_scope() as session:
+            return [
+                {
+                    "title": row.title,
+                    "content": row.content,
+                    "themes": row.themes or [],
+                    "parameters": row.parameters or {},
+                    "created_at": row.created_at.isoformat()
+                }
+                for row in session.execute(stmt)
+            ]
+    except SQLAlchemyError as e:
+        logger.error(f"Error retrieving stories: {str(e)}")
+        return []
+
+def count_stories(session_id):
+    """Count the stories saved for a session."""
+    if not init_db():
+        logger.error("Database not properly initialized")
+        return 0
+
+    stmt = select(func.count()).select_from(Story).where(Story.session_id == session_id)
+    try:
+        with session_scope() as session:
+            return session.scalar(stmt)
+    except SQLAlchemyError as e:
+        logger.error(f"Error counting stories: {str(e)}")
+        return 0
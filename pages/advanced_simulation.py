@@ -5,12 +5,211 @@ This page allows users to run sophisticated climate simulations using coupled
 differential equations to model climate system dynamics.
 """
 
+import math
+import functools
+from types import MappingProxyType
 import streamlit as st
 import pandas as pd
 import numpy as np
+import numba
 from datetime import datetime
 import plotly.graph_objects as go
 
+@functools.lru_cache(maxsize=32)
+def hex_to_rgba(hex_color, alpha=0.2):
+    """Convert a '#RRGGBB' color to an rgba() string"""
+    r, g, b = bytes.fromhex(hex_color.lstrip('#'))
+    return f"rgba({r}, {g}, {b}, {alpha})"
+
+# Uncertainty band fills for the built-in variable colors
+_RGBA_BANDS = {
+    '#FF5733': 'rgba(255, 87, 51, 0.2)',
+    '#4CAF50': 'rgba(76, 175, 80, 0.2)',
+    '#2196F3': 'rgba(33, 150, 243, 0.2)',
+    '#9C27B0': 'rgba(156, 39, 176, 0.2)',
+}
+
+# Default simulator parameters and initial state (copied per simulator)
+_DEFAULT_PARAMS = MappingProxyType({
+    'carbon_sensitivity': 3.0,
+    'ocean_heat_capacity': 14.0,
+    'carbon_cycle_feedback': 0.15,
+    'albedo_feedback': 0.3
+})
+
+_DEFAULT_INITIAL = MappingProxyType({
+    'temperature': 1.1,
+    'co2_concentration': 417,
+    'ice_extent': 10.5
+})
+
+# Emission rates based on scenarios
+_EMISSION_RATES = MappingProxyType({
+    'business_as_usual': 0.018,  # Increasing emissions
+    'moderate_mitigation': 0.005,  # Peak and decline
+    'strong_mitigation': -0.02    # Rapid reduction
+})
+
+# Variable configurations
+_VAR_CONFIG = MappingProxyType({
+    'temperature': {
+        'title': 'Global Temperature Anomaly',
+        'y_label': 'Temperature (°C)',
+        'color': '#FF5733'
+    },
+    'co2': {
+        'title': 'Atmospheric CO₂ Concentration',
+        'y_label': 'CO₂ (ppm)',
+        'color': '#4CAF50'
+    },
+    'sea_level': {
+        'title': 'Sea Level Rise',
+        'y_label': 'Sea Level Rise (cm)',
+        'color': '#2196F3'
+    },
+    'ice_extent': {
+        'title': 'Arctic Sea Ice Extent',
+        'y_label': 'Ice Extent (million km²)',
+        'color': '#9C27B0'
+    }
+})
+
+# Styled variable selector labels
+_VARIABLE_OPTIONS = MappingProxyType({
+    "temperature": "🌡️ Global Temperature Anomaly (°C)",
+    "co2": "💨 Atmospheric CO₂ Concentration (ppm)",
+    "sea_level": "🌊 Sea Level Rise (cm)",
+    "ice_extent": "❄️ Arctic Sea Ice Extent (million km²)"
+})
+
+_RISK_COLOR = MappingProxyType({"Low": "#4CAF50", "Moderate": "#FF9800", "High": "#F44336", "Severe": "#9C27B0"})
+
+@numba.njit(cache=True, fastmath=True)
+def _climate_state_kernel(step_rates, initial_temperature, initial_co2, initial_ice,
+                          carbon_sensitivity, ocean_heat_capacity, carbon_cycle_feedback,
+                          albedo_feedback):
+    """Step the CO2/temperature/ice recurrence, one step per entry of step_rates."""
+    n = step_rates.shape[0] + 1
+    temp_values = np.empty(n)
+    co2_values = np.empty(n)
+    ice_values = np.empty(n)
+    temp_values[0] = initial_temperature
+    co2_values[0] = initial_co2
+    ice_values[0] = initial_ice
+
+    # Loop-invariant factors of the forcing and temperature response
+    k_forcing = 5.35 / math.log(2.0) * carbon_sensitivity / 3.7
+    dt_over_ohc = 0.1 / ocean_heat_capacity
+    
+    for i in range(1, n):
+        # Ice extent change (albedo feedback), floored at zero
+        new_ice = ice_values[i-1] - albedo_feedback * temp_values[i-1] * 0.1
+        ice_values[i] = new_ice if new_ice > 0.0 else 0.0
+
+        # CO2 concentration change
+        co2_values[i] = (
+            co2_values[i-1] * (1 + step_rates[i-1]) +
+            temp_values[i-1] * carbon_cycle_feedback * 0.5
+        )
+        
+        # Temperature change based on CO2
+        forcing = k_forcing * math.log(co2_values[i] / 280.0)
+        temp_values[i] = temp_values[i-1] + forcing * dt_over_ohc
+    
+    return temp_values, co2_values, ice_values
+
+@st.cache_resource(show_spinner=False)
+def _get_climate_kernel():
+    """Return the climate kernel after a one-off warm-up call that compiles it"""
+    _climate_state_kernel(np.zeros(1), 1.1, 417.0, 10.5, 3.0, 14.0, 0.15, 0.3)
+    return _climate_state_kernel
+
+# Compile (or load from Numba's on-disk cache) when the page loads rather than
+# on the first "Run Simulation" click
+_get_climate_kernel()
+
+@st.cache_data(show_spinner=False)
+def _cached_run(current_year, years, scenario, carbon_sensitivity, ocean_heat_capacity,
+                carbon_cycle_feedback, albedo_feedback, initial_temperature, initial_co2,
+                initial_ice):
+    """Run a projection; identical parameter sets are served from Streamlit's cache."""
+    # Create time series
+    time_points = np.arange(years + 1, dtype=np.float64)
+    years_arr = (current_year + time_points).astype(np.int32)
+
+    # CO2 growth rate applied in each step
+    step_rates = np.full(years, _EMISSION_RATES[scenario])
+    if scenario == 'moderate_mitigation':
+        step_rates[30:] *= 0.5  # Decline after 30 years
+
+    # CO2 and temperature feed back on each other and ice is clipped at
+    # every step, so these are stepped sequentially in a compiled kernel
+    temp_values, co2_values, ice_values = _get_climate_kernel()(
+        step_rates,
+        initial_temperature,
+        initial_co2,
+        initial_ice,
+        carbon_sensitivity,
+        ocean_heat_capacity,
+        carbon_cycle_feedback,
+        albedo_feedback
+    )
+
+    # Sea level change (in cm)
+    sea_level_values = np.concatenate(
+        ([0.0], np.cumsum(0.3 * temp_values[:-1] + 0.05 * (10.5 - ice_values[:-1])))
+    )
+
+    # Create uncertainty ranges
+    temp_uncertainty = 0.2 * np.sqrt(time_points / 10.0)
+
+    # Combine the contiguous column arrays into a DataFrame without copying.
+    # The model is integrated in float64 but stored as float32, which is ample
+    # for its precision and halves the Plotly/CSV payload.
+    results = pd.DataFrame({
+        'year': years_arr,
+        'temperature': temp_values.astype(np.float32),
+        'temperature_lower': (temp_values - temp_uncertainty).astype(np.float32),
+        'temperature_upper': (temp_values + temp_uncertainty).astype(np.float32),
+        'co2': co2_values.astype(np.float32),
+        'ice_extent': ice_values.astype(np.float32),
+        'sea_level': sea_level_values.astype(np.float32)
+    }, copy=False)
+
+    return results
+
+@st.cache_data(show_spinner=False)
+def _analyze_tipping_points(results):
+    """Analyze simulation results for climate tipping points"""
+    tipping_points = {}
+    years_arr = results['year'].to_numpy()
+
+    # Analyze temperature for 1.5°C, 2.0°C and 3.0°C thresholds; argmax on the
+    # boolean mask finds the first crossing without building filtered frames
+    if 'temperature' in results:
+        temps = results['temperature'].to_numpy()
+        for threshold, label, risk in ((1.5, '1.5C', 'Moderate'), (2.0, '2.0C', 'High'), (3.0, '3.0C', 'Severe')):
+            idx = np.argmax(temps >= threshold)
+            if temps[idx] >= threshold:
+                tipping_points[f'{label}_threshold_year'] = int(years_arr[idx])
+                tipping_points[f'{label}_threshold_risk'] = risk
+
+    # Analyze Arctic sea ice for ice-free summers
+    if 'ice_extent' in results:
+        # Ice-free summer threshold is around 1 million km²
+        ice = results['ice_extent'].to_numpy()
+        idx = np.argmax(ice <= 1.0)
+        if ice[idx] <= 1.0:
+            tipping_points['ice_free_summer_year'] = int(years_arr[idx])
+            tipping_points['ice_free_impact'] = 'Major ecosystem disruption, albedo feedback acceleration'
+
+    return tipping_points
+
+@st.cache_data(show_spinner=False)
+def _results_csv(results):
+    """Format simulation results for download; cached so reruns skip the CSV writer"""
+    return results.to_csv(index=False, float_format='%.4f')
+
 def app():
     try:
         st.set_page_config(
@@ -35,19 +234,10 @@ def app():
     class SimpleClimateSimulator:
         def __init__(self):
             # Default parameters
-            self.params = {
-                'carbon_sensitivity': 3.0,
-                'ocean_heat_capacity': 14.0,
-                'carbon_cycle_feedback': 0.15,
-                'albedo_feedback': 0.3
-            }
+            self.params = dict(_DEFAULT_PARAMS)
             
             # Default initial state
-            self.initial = {
-                'temperature': 1.1,
-                'co2_concentration': 417,
-                'ice_extent': 10.5
-            }
+            self.initial = dict(_DEFAULT_INITIAL)
             
         def set_parameters(self, new_params):
             """Update simulation parameters"""
@@ -62,112 +252,36 @@ def app():
             Generate climate projection data based on parameters and scenario
             This is a simplified implementation that doesn't require scipy
             """
-            # Create time series
-            time_points = np.arange(0, years + 1)
-            current_year = datetime.now().year
-            years_list = [current_year + t for t in time_points]
-            
-            # Initialize arrays for results
-            temp_values = np.zeros(len(time_points))
-            co2_values = np.zeros(len(time_points))
-            ice_values = np.zeros(len(time_points))
-            sea_level_values = np.zeros(len(time_points))
-            
-            # Set initial values
-            temp_values[0] = self.initial['temperature']
-            co2_values[0] = self.initial['co2_concentration']
-            ice_values[0] = self.initial['ice_extent']
-            sea_level_values[0] = 0.0
-            
-            # Emission rates based on scenarios
-            emission_rates = {
-                'business_as_usual': 0.018,  # Increasing emissions
-                'moderate_mitigation': 0.005,  # Peak and decline
-                'strong_mitigation': -0.02    # Rapid reduction
-            }
-            
-            emission_rate = emission_rates[scenario]
-            
-            # Simple climate model simulation
-            for i in range(1, len(time_points)):
-                # Adjust CO2 growth rate based on scenario
-                if scenario == 'moderate_mitigation' and i > 30:
-                    current_rate = emission_rate * 0.5  # Decline after 30 years
-                else:
-                    current_rate = emission_rate
-                
-                # CO2 concentration change
-                co2_values[i] = (
-                    co2_values[i-1] * (1 + current_rate) + 
-                    temp_values[i-1] * self.params['carbon_cycle_feedback'] * 0.5
-                )
-                
-                # Temperature change based on CO2
-                forcing = 5.35 * np.log(co2_values[i] / 280) / np.log(2) * self.params['carbon_sensitivity'] / 3.7
-                temp_values[i] = temp_values[i-1] + forcing / self.params['ocean_heat_capacity'] * 0.1
-                
-                # Ice extent change
-                ice_change = -self.params['albedo_feedback'] * temp_values[i-1] * 0.1
-                ice_values[i] = max(0, ice_values[i-1] + ice_change)
-                
-                # Sea level change (in cm)
-                sea_level_values[i] = sea_level_values[i-1] + (0.3 * temp_values[i-1] + 0.05 * (10.5 - ice_values[i-1]))
-            
-            # Create uncertainty ranges
-            temp_uncertainty = 0.2 * np.sqrt(np.arange(len(time_points)) / 10)
-            
-            # Combine results into a DataFrame
-            results = pd.DataFrame({
-                'year': years_list,
-                'temperature': temp_values,
-                'temperature_lower': temp_values - temp_uncertainty,
-                'temperature_upper': temp_values + temp_uncertainty,
-                'co2': co2_values,
-                'ice_extent': ice_values,
-                'sea_level': sea_level_values
-            })
-            
-            return results
+            return _cached_run(
+                datetime.now().year, years, scenario,
+                float(self.params['carbon_sensitivity']),
+                float(self.params['ocean_heat_capacity']),
+                float(self.params['carbon_cycle_feedback']),
+                float(self.params['albedo_feedback']),
+                float(self.initial['temperature']),
+                float(self.initial['co2_concentration']),
+                float(self.initial['ice_extent'])
+            )
             
         def visualize_simulation(self, results, variable='temperature'):
             """Create interactive plotly visualization"""
-            # Variable configurations
-            var_config = {
-                'temperature': {
-                    'title': 'Global Temperature Anomaly',
-                    'y_label': 'Temperature (°C)',
-                    'color': '#FF5733'
-                },
-                'co2': {
-                    'title': 'Atmospheric CO₂ Concentration',
-                    'y_label': 'CO₂ (ppm)',
-                    'color': '#4CAF50'
-                },
-                'sea_level': {
-                    'title': 'Sea Level Rise',
-                    'y_label': 'Sea Level Rise (cm)',
-                    'color': '#2196F3'
-                },
-                'ice_extent': {
-                    'title': 'Arctic Sea Ice Extent',
-                    'y_label': 'Ice Extent (million km²)',
-                    'color': '#9C27B0'
-                }
-            }
-            
-            config = var_config.get(variable, {
+            config = _VAR_CONFIG.get(variable, {
                 'title': variable.replace('_', ' ').title(),
                 'y_label': variable,
                 'color': '#00a3e0'
             })
             
+            # Plotly serializes contiguous ndarrays fastest, so pass those
+            # rather than Series
+            years_np = np.ascontiguousarray(results['year'].to_numpy())
+            
             # Create figure
             fig = go.Figure()
             
             # Add main trace
             fig.add_trace(go.Scatter(
-                x=results['year'],
-                y=results[variable],
+                x=years_np,
+                y=np.ascontiguousarray(results[variable].to_numpy()),
                 mode='lines',
                 name=config['y_label'],
                 line=dict(color=config['color'], width=3)
@@ -175,16 +289,15 @@ def app():
             
             # Add uncertainty range if available
             if f"{variable}_lower" in results.columns and f"{variable}_upper" in results.columns:
-                # Convert hex color to rgba
-                def hex_to_rgba(hex_color, alpha=0.2):
-                    hex_color = hex_color.lstrip('#')
-                    return f"rgba({int(hex_color[0:2], 16)}, {int(hex_color[2:4], 16)}, {int(hex_color[4:6], 16)}, {alpha})"
+                # Closed band polygon: upper edge forward, lower edge back
+                up = np.ascontiguousarray(results[f"{variable}_upper"].to_numpy())
+                lo = np.ascontiguousarray(results[f"{variable}_lower"].to_numpy())
                 
                 fig.add_trace(go.Scatter(
-                    x=results['year'].tolist() + results['year'].tolist()[::-1],
-                    y=results[f"{variable}_upper"].tolist() + results[f"{variable}_lower"].tolist()[::-1],
+                    x=np.concatenate([years_np, years_np[::-1]]),
+                    y=np.concatenate([up, lo[::-1]]),
                     fill='toself',
-                    fillcolor=hex_to_rgba(config['color']),
+                    fillcolor=_RGBA_BANDS.get(config['color']) or hex_to_rgba(config['color']),
                     line=dict(color='rgba(255,255,255,0)'),
                     showlegend=False,
                     name='Uncertainty Range'
@@ -210,37 +323,7 @@ def app():
             
         def analyze_tipping_points(self, results):
             """Analyze simulation results for climate tipping points"""
-            tipping_points = {}
-            
-            # Analyze temperature for 1.5°C and 2.0°C thresholds
-            if 'temperature' in results:
-                # Find when temperature crosses 1.5°C
-                temp_1_5 = results[results['temperature'] >= 1.5]
-                if not temp_1_5.empty:
-                    tipping_points['1.5C_threshold_year'] = int(temp_1_5.iloc[0]['year'])
-                    tipping_points['1.5C_threshold_risk'] = 'Moderate'
-                
-                # Find when temperature crosses 2.0°C
-                temp_2_0 = results[results['temperature'] >= 2.0]
-                if not temp_2_0.empty:
-                    tipping_points['2.0C_threshold_year'] = int(temp_2_0.iloc[0]['year'])
-                    tipping_points['2.0C_threshold_risk'] = 'High'
-                
-                # Find when temperature crosses 3.0°C
-                temp_3_0 = results[results['temperature'] >= 3.0]
-                if not temp_3_0.empty:
-                    tipping_points['3.0C_threshold_year'] = int(temp_3_0.iloc[0]['year'])
-                    tipping_points['3.0C_threshold_risk'] = 'Severe'
-            
-            # Analyze Arctic sea ice for ice-free summers
-            if 'ice_extent' in results:
-                # Ice-free summer threshold is around 1 million km²
-                ice_free = results[results['ice_extent'] <= 1.0]
-                if not ice_free.empty:
-                    tipping_points['ice_free_summer_year'] = int(ice_free.iloc[0]['year'])
-                    tipping_points['ice_free_impact'] = 'Major ecosystem disruption, albedo feedback acceleration'
-            
-            return tipping_points
+            return _analyze_tipping_points(results)
     
     # Create simulator instance
     simulator = SimpleClimateSimulator()
@@ -365,17 +448,10 @@ def app():
             st.subheader("Climate Projection Visualization")
             
             # Styled variable selector
-            variable_options = {
-                "temperature": "🌡️ Global Temperature Anomaly (°C)",
-                "co2": "💨 Atmospheric CO₂ Concentration (ppm)",
-                "sea_level": "🌊 Sea Level Rise (cm)",
-                "ice_extent": "❄️ Arctic Sea Ice Extent (million km²)"
-            }
-            
             variable = st.radio(
                 "Select climate variable to visualize:",
-                options=list(variable_options.keys()),
-                format_func=lambda x: variable_options[x],
+                options=list(_VARIABLE_OPTIONS.keys()),
+                format_func=lambda x: _VARIABLE_OPTIONS[x],
                 horizontal=True
             )
             
@@ -390,8 +466,10 @@ def app():
                 else:
                     st.success(f"✅ Projected warming of {results['temperature'].iloc[-1]:.1f}°C is within the Paris Agreement target")
             elif variable == "ice_extent":
-                if min(results["ice_extent"]) < 1.0:
-                    st.warning(f"⚠️ Projection shows ice-free Arctic summers by {int(results[results['ice_extent'] <= 1.0].iloc[0]['year'])}")
+                # Reuse the cached tipping-point scan instead of re-filtering the frame
+                ice_free_year = simulator.analyze_tipping_points(results).get('ice_free_summer_year')
+                if ice_free_year is not None:
+                    st.warning(f"⚠️ Projection shows ice-free Arctic summers by {ice_free_year}")
         
         with tabs[1]:
             # Analyze tipping points
@@ -402,47 +480,52 @@ def app():
                 # Create columns for temperature and impact
                 temp_col, impact_col = st.columns(2)
                 
+                # Each column is sent as one markdown element; the parts are
+                # unindented so joining them cannot turn lines into code blocks
                 with temp_col:
-                    st.markdown("""
-                    <div style="padding: 15px; border-radius: 10px; background-color: rgba(33, 150, 243, 0.1); border-left: 5px solid #2196F3;">
-                        <h4>Temperature Thresholds</h4>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    html_parts = [
+                        '<div style="padding: 15px; border-radius: 10px; background-color: rgba(33, 150, 243, 0.1); border-left: 5px solid #2196F3;">'
+                        '<h4>Temperature Thresholds</h4>'
+                        '</div>'
+                    ]
                     
                     for key, value in tipping_points.items():
                         if "_threshold_year" in key:
                             temp = key.split('_')[0]
                             risk = tipping_points.get(f"{temp}_threshold_risk", "Unknown")
-                            risk_color = {"Low": "#4CAF50", "Moderate": "#FF9800", "High": "#F44336", "Severe": "#9C27B0"}
                             
-                            st.markdown(f"""
-                            <div style="margin: 10px 0; padding: 10px; border-radius: 5px; background-color: #f5f5f5;">
-                                <div style="font-weight: bold; color: {risk_color.get(risk, '#000')}">
-                                    {temp.upper()} threshold crossing: {value}
-                                </div>
-                                <div>Risk level: {risk}</div>
-                            </div>
-                            """, unsafe_allow_html=True)
+                            html_parts.append(
+                                '<div style="margin: 10px 0; padding: 10px; border-radius: 5px; background-color: #f5f5f5;">'
+                                f'<div style="font-weight: bold; color: {_RISK_COLOR.get(risk, "#000")}">'
+                                f'{temp.upper()} threshold crossing: {value}'
+                                '</div>'
+                                f'<div>Risk level: {risk}</div>'
+                                '</div>'
+                            )
+                    
+                    st.markdown(''.join(html_parts), unsafe_allow_html=True)
                 
                 with impact_col:
-                    st.markdown("""
-                    <div style="padding: 15px; border-radius: 10px; background-color: rgba(244, 67, 54, 0.1); border-left: 5px solid #F44336;">
-                        <h4>System Impacts</h4>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    html_parts = [
+                        '<div style="padding: 15px; border-radius: 10px; background-color: rgba(244, 67, 54, 0.1); border-left: 5px solid #F44336;">'
+                        '<h4>System Impacts</h4>'
+                        '</div>'
+                    ]
                     
                     for key, value in tipping_points.items():
                         if "_year" in key and "_threshold" not in key:
                             impact = tipping_points.get(f"{key.split('_')[0]}_{key.split('_')[1]}_impact", "Significant effects")
                             
-                            st.markdown(f"""
-                            <div style="margin: 10px 0; padding: 10px; border-radius: 5px; background-color: #f5f5f5;">
-                                <div style="font-weight: bold;">
-                                    {key.replace('_', ' ').title().replace('Year', '')}: {value}
-                                </div>
-                                <div>{impact}</div>
-                            </div>
-                            """, unsafe_allow_html=True)
+                            html_parts.append(
+                                '<div style="margin: 10px 0; padding: 10px; border-radius: 5px; background-color: #f5f5f5;">'
+                                '<div style="font-weight: bold;">'
+                                f'{key.replace("_", " ").title().replace("Year", "")}: {value}'
+                                '</div>'
+                                f'<div>{impact}</div>'
+                                '</div>'
+                            )
+                    
+                    st.markdown(''.join(html_parts), unsafe_allow_html=True)
             else:
                 st.info("No tipping points detected within the simulation timeframe.")
         
@@ -452,7 +535,7 @@ def app():
             st.dataframe(results, use_container_width=True)
             
             # Download button for CSV
-            csv = results.to_csv(index=False)
+            csv = _results_csv(results)
             scenario_name = st.session_state.simulation_scenario
             current_date = datetime.now().strftime("%Y%m%d")
             filename = f"climate_simulation_{scenario_name}_{current_date}.csv"
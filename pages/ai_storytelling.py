@@ -9,9 +9,14 @@ import os
 import numpy as np
 import pandas as pd
 import json
+import html
+import string
+import time
+import uuid
 from datetime import datetime, timedelta
 
 from utils.ai_storytelling.storyteller import ClimateStoryteller
+from database.operations import save_stories, get_stories, count_stories
 
 # Page configuration
 st.set_page_config(
@@ -21,25 +26,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize session state for storytelling
-if 'stories' not in st.session_state:
-    st.session_state.stories = []
-    
-if 'template_parameters' not in st.session_state:
-    st.session_state.template_parameters = {}
-    
-if 'regions' not in st.session_state:
-    st.session_state.regions = []
-
-# Initialize the storyteller
-storyteller = ClimateStoryteller()
-
-# Check if Anthropic API key is available
-anthropic_api_key = os.environ.get("ANTHROPIC_API_KEY")
-api_available = anthropic_api_key is not None
-
-# Page header with custom styling
-st.markdown("""
+# Page styles, kept as a constant so reruns do not rebuild the string
+_STORYTELLING_CSS = """
 <style>
     .storytelling-header {
         text-align: center;
@@ -115,7 +103,109 @@ st.markdown("""
         border: 1px solid #ddd;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Static choices for the common template parameters
+CURRENT_YEAR = datetime.now().year
+EVENT_OPTIONS = ("drought", "flood", "wildfire", "hurricane", "heat wave", "sea level rise")
+STRATEGY_OPTIONS = ("urban design", "sustainable agriculture", "renewable energy", "coastal protection", "water conservation")
+
+# Widget factory for each template parameter with special handling
+PARAM_WIDGETS = {
+    "region": lambda: st.selectbox("Select region", _get_regions(storyteller, _STORY_DATA_VERSION)),
+    "year": lambda: st.slider("Select year", CURRENT_YEAR, CURRENT_YEAR + 100, CURRENT_YEAR + 30),
+    "climate_event": lambda: st.selectbox("Select climate_event", EVENT_OPTIONS),
+    "adaptation_strategy": lambda: st.selectbox("Select adaptation_strategy", STRATEGY_OPTIONS),
+}
+
+# Story card markup, parsed once; cards are single-line so several can be
+# joined into one markdown element without breaking the HTML block
+_STORY_TPL = string.Template(
+    '<div class="story-card">'
+    '<h3 class="story-title">$title</h3>'
+    '<p class="story-meta">$meta</p>'
+    '<div class="story-content">$content</div>'
+    '<div class="story-tags">$tags</div>'
+    '</div>'
+)
+
+def prepare_story(story):
+    """Precompute the escaped HTML fragments of a story before rendering it."""
+    story["_tags_html"] = "".join(f'<span class="story-tag">{html.escape(t)}</span>' for t in story["themes"])
+    story["_params_str"] = html.escape(", ".join(f"{k}={v}" for k, v in story["parameters"].items()))
+    story["_created_display"] = datetime.fromisoformat(story["created_at"]).strftime("%Y-%m-%d %H:%M")
+    # Model output is escaped so it cannot inject markup into the page
+    story["_content_html"] = html.escape(story["content"]).replace("\n", "<br>")
+    return story
+
+def render_card(story):
+    """Render a generated story as story-card HTML."""
+    return _STORY_TPL.substitute(
+        title=story["title"],
+        meta=f"Generated on {story['_created_display']} • Based on parameters: {story['_params_str']}",
+        content=story["_content_html"],
+        tags=story["_tags_html"]
+    )
+
+# Initialize session state for storytelling
+# Stories live in the database; session state only keeps the key to them
+if 'story_session_id' not in st.session_state:
+    st.session_state.story_session_id = uuid.uuid4().hex
+    
+if 'template_parameters' not in st.session_state:
+    st.session_state.template_parameters = {}
+    
+if 'regions' not in st.session_state:
+    st.session_state.regions = []
+
+if '_pending_requests' not in st.session_state:
+    st.session_state._pending_requests = []
+
+# Submitted story batches still being processed by the API
+if '_story_batches' not in st.session_state:
+    st.session_state._story_batches = []
+
+# Stories shown at first and added by each "Load more" click
+STORIES_PER_PAGE = 10
+
+# Generate clicks arriving within this window are answered by one API call
+_DEBOUNCE_SECONDS = 0.25
+
+# How often pending story batches are checked, and how long before one is cancelled
+_BATCH_POLL_SECONDS = 5
+_BATCH_MAX_WAIT_SECONDS = 600
+
+# Build the storyteller once per process (and API key) instead of every rerun
+@st.cache_resource
+def _get_storyteller(api_key):
+    return ClimateStoryteller(anthropic_api_key=api_key)
+
+# Templates and region suggestions are static; bump the version to refresh them
+_STORY_DATA_VERSION = 1
+
+@st.cache_data
+def _get_templates(_storyteller, version):
+    return _storyteller.get_available_templates()
+
+@st.cache_data
+def _get_regions(_storyteller, version):
+    return _storyteller.get_region_suggestions()
+
+@st.cache_data
+def _build_template_options(templates_sig):
+    # templates_sig is a tuple of (key, title) pairs
+    return {title: key for key, title in templates_sig}
+
+# Check if Anthropic API key is available
+anthropic_api_key = os.environ.get("ANTHROPIC_API_KEY")
+api_available = anthropic_api_key is not None
+
+# Initialize the storyteller
+storyteller = _get_storyteller(anthropic_api_key)
+
+# Page header with custom styling. The stylesheet is re-emitted on every
+# rerun because Streamlit drops elements a rerun does not render again
+st.html(_STORYTELLING_CSS)
 
 # Header
 st.markdown("""
@@ -135,20 +225,20 @@ if not api_available:
     </div>
     """, unsafe_allow_html=True)
 
-# Main content layout
-col1, col2 = st.columns([2, 3])
+# Get available templates
+templates = _get_templates(storyteller, _STORY_DATA_VERSION)
 
-with col1:
+# The generator form and the stories pane are fragments, so adjusting a
+# widget reruns only the form instead of re-rendering every story
+@st.fragment
+def render_story_generator():
     st.markdown("### Generate a Climate Story")
     st.markdown("Use our AI storyteller to generate engaging narratives about climate change impacts and solutions.")
     
-    # Get available templates
-    templates = storyteller.get_available_templates()
-    
     # Story template selection
-    template_options = {}
-    for key, template in templates.items():
-        template_options[template["title"]] = key
+    template_options = _build_template_options(
+        tuple((key, template["title"]) for key, template in templates.items())
+    )
         
     selected_template_title = st.selectbox(
         "Select a story template", 
@@ -167,50 +257,136 @@ with col1:
     
     # Input fields for required parameters
     for param in selected_template["required_parameters"]:
-        # Special handling for common parameters
-        if param == "region":
-            regions = storyteller.get_region_suggestions()
-            parameters[param] = st.selectbox(f"Select {param}", regions)
-        elif param == "year":
-            current_year = datetime.now().year
-            parameters[param] = st.slider(f"Select {param}", current_year, current_year + 100, current_year + 30)
-        elif param == "climate_event":
-            event_options = ["drought", "flood", "wildfire", "hurricane", "heat wave", "sea level rise"]
-            parameters[param] = st.selectbox(f"Select {param}", event_options)
-        elif param == "adaptation_strategy":
-            strategy_options = ["urban design", "sustainable agriculture", "renewable energy", "coastal protection", "water conservation"]
-            parameters[param] = st.selectbox(f"Select {param}", strategy_options)
-        else:
-            parameters[param] = st.text_input(f"Enter {param}")
+        # Special handling for common parameters, plain text input otherwise
+        widget = PARAM_WIDGETS.get(param)
+        parameters[param] = widget() if widget else st.text_input(f"Enter {param}")
     
     # Story length
     max_tokens = st.slider("Story length", 500, 2000, 1000, 100)
     
+    # Several variants are generated in one discounted batch request
+    variants = st.number_input("Variants", min_value=1, max_value=10, value=1, step=1)
+    
     # Generate button
     generate_button = st.button("Generate Story", disabled=not api_available)
     
-    if generate_button:
+    if generate_button and variants == 1:
+        # Queue the request, then wait briefly: another click in the window
+        # interrupts this run and the rerun flushes both requests together
+        st.session_state._pending_requests.append((selected_template_key, dict(parameters)))
+        time.sleep(_DEBOUNCE_SECONDS)
+    
+    if generate_button and variants > 1:
+        # Submit the batch and return at once; render_batch_status polls it
+        parameters_list = [dict(parameters) for _ in range(variants)]
+        batch = storyteller.submit_story_batch(
+            selected_template_key,
+            parameters_list,
+            max_tokens=max_tokens,
+            use_prompt_cache=True
+        )
+        
+        if "error" in batch:
+            st.error(f"Error generating story: {batch['error']}")
+        elif batch.get("status") == "API key required":
+            st.warning(batch["message"])
+        else:
+            st.session_state._story_batches.append({
+                "id": batch["batch_id"],
+                "template_key": selected_template_key,
+                "parameters_list": parameters_list,
+                "submitted_at": time.time()
+            })
+            # Rerun the whole page so the batch poller starts
+            st.rerun()
+    
+    elif st.session_state._pending_requests:
         with st.spinner("Generating your climate story with AI..."):
-            story = storyteller.generate_story(
-                selected_template_key,
-                parameters,
-                max_tokens=max_tokens
-            )
+            # Take what fits in one response; the rest is sent by the next run
+            flush_size = storyteller.stories_per_set(max_tokens)
+            pending = st.session_state._pending_requests[:flush_size]
+            st.session_state._pending_requests = st.session_state._pending_requests[flush_size:]
+            if len(pending) == 1:
+                template_key, story_parameters = pending[0]
+                story = storyteller.generate_story(
+                    template_key,
+                    story_parameters,
+                    max_tokens=max_tokens,
+                    use_prompt_cache=True
+                )
+            else:
+                story = storyteller.generate_story_set(pending, max_tokens=max_tokens, use_prompt_cache=True)
             
-            if "error" in story:
+            if isinstance(story, dict) and "error" in story:
                 st.error(f"Error generating story: {story['error']}")
-            elif "status" in story and story["status"] == "API key required":
+            elif isinstance(story, dict) and story.get("status") == "API key required":
                 st.warning(story["message"])
+            elif save_stories(st.session_state.story_session_id, story if isinstance(story, list) else [story]):
+                # The stories pane lives outside this fragment, so rerun
+                # the whole page and show the outcome afterwards
+                missing = len(pending) - (len(story) if isinstance(story, list) else 1)
+                if missing:
+                    st.session_state._story_notice = ("warning", f"{missing} of {len(pending)} stories could not be generated.")
+                else:
+                    st.session_state._story_notice = ("success", "Story generated successfully!")
+                st.rerun()
             else:
-                # Add to session state
-                st.session_state.stories.append(story)
-                # Display success message
-                st.success("Story generated successfully!")
+                st.error("Error saving the generated story. Please try again.")
+    
+    notice = st.session_state.pop("_story_notice", None)
+    if notice:
+        # Display the outcome of the last generation
+        level, message = notice
+        getattr(st, level)(message)
 
-with col2:
+# Polls submitted story batches in the background of the page. It is only
+# rendered while batches are pending, so the timer stops with the last one
+@st.fragment(run_every=_BATCH_POLL_SECONDS)
+def render_batch_status():
+    finished = False
+    
+    for batch in list(st.session_state._story_batches):
+        result = storyteller.poll_story_batch(batch["id"], batch["template_key"], batch["parameters_list"])
+        
+        if result.get("status") == "ended":
+            st.session_state._story_batches.remove(batch)
+            finished = True
+            stories, failed = result["stories"], result["failed"]
+            if not stories:
+                st.session_state._story_notice = ("error", "The story batch finished without any stories. Please try again.")
+            elif not save_stories(st.session_state.story_session_id, stories):
+                st.session_state._story_notice = ("error", "Error saving the generated stories. Please try again.")
+            elif failed:
+                st.session_state._story_notice = ("warning", f"{len(stories)} stories generated, {failed} failed.")
+            else:
+                st.session_state._story_notice = ("success", f"{len(stories)} stories generated successfully!")
+                
+        elif time.time() - batch["submitted_at"] > _BATCH_MAX_WAIT_SECONDS:
+            # Stop paying for a batch nobody is waiting on any more
+            storyteller.cancel_story_batch(batch["id"])
+            st.session_state._story_batches.remove(batch)
+            finished = True
+            st.session_state._story_notice = ("error", "The story batch took too long and was cancelled. Please try again later.")
+            
+        elif "error" in result:
+            # Keep the batch and check again on the next tick
+            st.warning(f"{result['error']}, retrying...")
+            
+        else:
+            processed, total = result["processed"], result["total"]
+            st.progress(processed / total, text=f"Story batch: {processed}/{total} stories ready")
+    
+    if finished:
+        # The stories pane lives outside this fragment
+        st.rerun()
+
+@st.fragment
+def render_stories_pane():
     st.markdown("### Your Climate Stories")
     
-    if not st.session_state.stories:
+    story_count = count_stories(st.session_state.story_session_id)
+    
+    if not story_count:
         if api_available:
             st.info("Generate your first climate story using the form on the left.")
         else:
@@ -223,41 +399,37 @@ with col2:
                 "parameters": {"year": 2050, "region": "Coastal Cities", "adaptation_strategy": "floating architecture"}
             }
             
-            st.markdown("""
-            <div class="story-card">
-                <h3 class="story-title">{}</h3>
-                <p class="story-meta">Example Story Format</p>
-                <div class="story-content">{}</div>
-                <div class="story-tags">
-                    {}
-                </div>
-            </div>
-            """.format(
-                example_story["title"],
-                example_story["content"],
-                "".join([f'<span class="story-tag">{theme}</span>' for theme in example_story["themes"]])
+            st.markdown(_STORY_TPL.substitute(
+                title=example_story["title"],
+                meta="Example Story Format",
+                content=example_story["content"],
+                tags="".join([f'<span class="story-tag">{theme}</span>' for theme in example_story["themes"]])
             ), unsafe_allow_html=True)
             
             st.markdown("*This is an example of how stories will appear once generated with a valid API key.*")
     else:
-        # Display generated stories
-        for story in reversed(st.session_state.stories):
-            st.markdown("""
-            <div class="story-card">
-                <h3 class="story-title">{}</h3>
-                <p class="story-meta">Generated on {} • Based on parameters: {}</p>
-                <div class="story-content">{}</div>
-                <div class="story-tags">
-                    {}
-                </div>
-            </div>
-            """.format(
-                story["title"],
-                datetime.fromisoformat(story["created_at"]).strftime("%Y-%m-%d %H:%M"),
-                ", ".join([f"{k}={v}" for k, v in story["parameters"].items()]),
-                story["content"].replace("\n", "<br>"),
-                "".join([f'<span class="story-tag">{theme}</span>' for theme in story["themes"]])
-            ), unsafe_allow_html=True)
+        # Load and render only the visible window of stories, newest first,
+        # as a single markdown element
+        visible_count = st.session_state.get("_visible_count", STORIES_PER_PAGE)
+        stories = get_stories(st.session_state.story_session_id, limit=visible_count)
+        html_parts = [render_card(prepare_story(story)) for story in stories]
+        st.markdown("\n".join(html_parts), unsafe_allow_html=True)
+        
+        if story_count > visible_count and st.button("Load more"):
+            # Only this fragment reruns to show the extra stories
+            st.session_state._visible_count = visible_count + STORIES_PER_PAGE
+            st.rerun(scope="fragment")
+
+# Main content layout
+col1, col2 = st.columns([2, 3])
+
+with col1:
+    render_story_generator()
+    if st.session_state._story_batches:
+        render_batch_status()
+
+with col2:
+    render_stories_pane()
 
 # Information about the AI storytelling feature
 st.markdown("### About AI Climate Storytelling")
@@ -297,4 +469,4 @@ with st.expander("Technical Details"):
     # Display Claude API status
     st.markdown(f"**Claude API Status:** {'Connected' if api_available else 'Not Connected'}")
     st.markdown(f"**Available Templates:** {len(templates)}")
-    st.markdown(f"**Stories Generated:** {len(st.session_state.stories)}")
\ No newline at end of file
+    st.markdown(f"**Stories Generated:** {count_stories(st.session_state.story_session_id)}")
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""Tests for combining several story requests into one API call."""
+
+from types import SimpleNamespace
+from unittest import mock
+
+from utils.ai_storytelling.storyteller import ClimateStoryteller, MAX_OUTPUT_TOKENS, STORY_DELIMITER
+
+
+def _response(text):
+    """Build a Messages API response carrying a single text block."""
+    return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+def _storyteller(*responses):
+    """Storyteller whose client returns the given responses in turn."""
+    storyteller = ClimateStoryteller(anthropic_api_key="test-key")
+    client = mock.Mock()
+    client.messages.create.side_effect = list(responses)
+    storyteller._client = mock.Mock(return_value=client)
+    return storyteller, client.messages.create
+
+
+REQUESTS = [
+    ("personal_impact", {"region": "Fiji"}),
+    ("personal_impact", {"region": "Chile"}),
+    ("personal_impact", {"region": "Kenya"}),
+]
+
+
+def test_story_set_splits_matching_response_in_order():
+    storyteller, create = _storyteller(_response(f"Fiji story\n{STORY_DELIMITER}\nChile story\n{STORY_DELIMITER}\nKenya story"))
+
+    stories = storyteller.generate_story_set(REQUESTS, max_tokens=1000)
+
+    assert [story["content"] for story in stories] == ["Fiji story", "Chile story", "Kenya story"]
+    assert [story["parameters"]["region"] for story in stories] == ["Fiji", "Chile", "Kenya"]
+    assert create.call_count == 1
+
+
+def test_story_set_caps_combined_output_tokens():
+    storyteller, create = _storyteller(_response(f"A\n{STORY_DELIMITER}\nB\n{STORY_DELIMITER}\nC"))
+
+    storyteller.generate_story_set(REQUESTS, max_tokens=4000)
+
+    assert create.call_args.kwargs["max_tokens"] == MAX_OUTPUT_TOKENS
+
+
+def test_story_set_short_response_generates_each_story_separately():
+    # The middle story is missing, so "Kenya story" must not be saved as Chile's
+    storyteller, create = _storyteller(
+        _response(f"Fiji story\n{STORY_DELIMITER}\nKenya story"),
+        _response("Fiji story"),
+        _response("Chile story"),
+        _response("Kenya story"),
+    )
+
+    stories = storyteller.generate_story_set(REQUESTS, max_tokens=1000)
+
+    assert [(story["parameters"]["region"], story["content"]) for story in stories] == [
+        ("Fiji", "Fiji story"), ("Chile", "Chile story"), ("Kenya", "Kenya story")
+    ]
+    assert create.call_count == 1 + len(REQUESTS)
+
+
+def test_story_set_short_response_drops_failed_stories():
+    storyteller, _ = _storyteller(
+        _response("One merged story"),
+        _response("Fiji story"),
+        RuntimeError("overloaded"),
+        _response("Kenya story"),
+    )
+
+    stories = storyteller.generate_story_set(REQUESTS, max_tokens=1000)
+
+    assert [story["parameters"]["region"] for story in stories] == ["Fiji", "Kenya"]
+
+
+def test_story_set_api_failure_returns_error():
+    storyteller, _ = _storyteller(RuntimeError("unavailable"))
+
+    result = storyteller.generate_story_set(REQUESTS, max_tokens=1000)
+
+    assert "error" in result
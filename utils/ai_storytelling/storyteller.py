@@ -9,6 +9,7 @@ through engaging, personalized stories.
 import os
 import json
 import logging
+import re
 import numpy as np
 import pandas as pd
 from datetime import datetime
@@ -17,6 +18,24 @@ from datetime import datetime
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Separator line the model is asked to put between stories in a combined request
+STORY_DELIMITER = "====="
+
+# Output token limit of the story model; a combined request cannot ask for more
+MAX_OUTPUT_TOKENS = 8192
+
+# Most stories combined into one generate_story_set call
+MAX_STORIES_PER_SET = 8
+
+# Instructions shared by every story request, sent as the system prompt so the
+# prefix is identical across calls and eligible for prompt caching
+STORY_SYSTEM_PROMPT = (
+    "You are an expert climate science communicator. Make each story vivid, emotional, "
+    "and scientifically accurate. Include specific details about climate impacts and "
+    "solutions. Format the response as an engaging narrative with a clear beginning, "
+    "middle, and end."
+)
+
 class ClimateStoryteller:
     """
     AI-powered climate storytelling engine.
@@ -61,7 +80,7 @@ class ClimateStoryteller:
             logger.warning(f"Could not load story templates: {str(e)}. Using defaults.")
             return default_templates
             
-    def generate_story(self, template_key, parameters=None, max_tokens=1000):
+    def generate_story(self, template_key, parameters=None, max_tokens=1000, use_prompt_cache=False):
         """
         Generate a climate story based on selected template and parameters.
         
@@ -69,6 +88,7 @@ class ClimateStoryteller:
             template_key: Key for the story template to use
             parameters: Dictionary of parameters to fill in the template
             max_tokens: Maximum length of the story
+            use_prompt_cache: Mark the system prompt for Anthropic prompt caching
             
         Returns:
             Dictionary containing the generated story and metadata
@@ -85,38 +105,15 @@ class ClimateStoryteller:
         # If we have Anthropic API access, use it to generate the story
         if self.anthropic_api_key:
             try:
-                # Import here to avoid dependency issues if not installed
-                import anthropic
-                from anthropic import Anthropic
-                
-                client = Anthropic(
-                    api_key=self.anthropic_api_key,
-                )
-                
-                # Fill in the prompt template with parameters
-                prompt = template["prompt_template"]
-                for key, value in parameters.items():
-                    prompt = prompt.replace(f"{{{key}}}", str(value))
-                
-                # The newest Anthropic model is "claude-3-5-sonnet-20241022", not "claude-3-sonnet-20240229". 
-                # claude-3-5-sonnet-20241022 was released after your knowledge cutoff.
-                # Always prefer using claude-3-5-sonnet-20241022 as it is the latest model.
-                response = client.messages.create(
-                    model="claude-3-5-sonnet-20241022",
-                    max_tokens=max_tokens,
-                    messages=[
-                        {
-                            "role": "user", 
-                            "content": f"You are an expert climate science communicator. {prompt} Make the story vivid, emotional, and scientifically accurate. Include specific details about climate impacts and solutions. Format the response as an engaging narrative with a clear beginning, middle, and end."
-                        }
-                    ]
+                response = self._client().messages.create(
+                    **self._message_params(self._fill_prompt(template, parameters), max_tokens, use_prompt_cache)
                 )
                 
                 story_text = response.content[0].text
                 
             except Exception as e:
                 logger.error(f"Error generating story with Anthropic API: {str(e)}")
-                story_text = self._generate_fallback_story(template, parameters)
+                return {"error": "The story service is unavailable, please try again later"}
         else:
             # If no API key, generate a prompt that would be used
             prompt_text = template["prompt_template"]
@@ -140,15 +137,250 @@ class ClimateStoryteller:
             "parameters": parameters
         }
         
-    def _generate_fallback_story(self, template, parameters):
-        """Generate a simple fallback story when API is unavailable."""
-        # This should not be used in production, only when API fails unexpectedly
-        title = template["title"]
+    def submit_story_batch(self, template_key, parameters_list, max_tokens=1000, use_prompt_cache=False):
+        """
+        Submit several stories as one Anthropic Message Batches request.
+        
+        Batched requests are billed at half the price of individual calls.
+        The call returns as soon as the batch is created; check on it with
+        poll_story_batch and stop it with cancel_story_batch.
+        
+        Args:
+            template_key: Key for the story template to use
+            parameters_list: List of parameter dictionaries, one per story
+            max_tokens: Maximum length of each story
+            use_prompt_cache: Mark the system prompt for Anthropic prompt caching
+            
+        Returns:
+            Dictionary with the "batch_id", or a dictionary with an error or
+            status message as for generate_story
+        """
+        if template_key not in self.story_templates:
+            logger.error(f"Story template '{template_key}' not found")
+            return {"error": f"Story template '{template_key}' not found"}
+        
+        if not self.anthropic_api_key:
+            # Same response as a single story without an API key
+            return self.generate_story(template_key, parameters_list[0] if parameters_list else {}, max_tokens,
+                                       use_prompt_cache)
+            
+        template = self.story_templates[template_key]
+        
+        try:
+            batch = self._client().messages.batches.create(
+                requests=[
+                    {
+                        "custom_id": f"story-{i}",
+                        "params": self._message_params(
+                            self._fill_prompt(template, parameters or {}), max_tokens, use_prompt_cache
+                        )
+                    }
+                    for i, parameters in enumerate(parameters_list)
+                ]
+            )
+        except Exception as e:
+            logger.error(f"Error submitting story batch to Anthropic API: {str(e)}")
+            return {"error": "Could not submit the story batch, please try again later"}
+            
+        return {"batch_id": batch.id}
+        
+    def poll_story_batch(self, batch_id, template_key, parameters_list):
+        """
+        Check a submitted story batch and collect its stories once it has ended.
+        
+        Args:
+            batch_id: ID returned by submit_story_batch
+            template_key: Template the batch was submitted with
+            parameters_list: Parameter dictionaries the batch was submitted with
+            
+        Returns:
+            While the batch runs, a dictionary with status "processing" and the
+            "processed" and "total" request counts. Once it has ended, status
+            "ended" with the succeeded "stories" in submission order and the
+            number of "failed" requests. A dictionary with an "error" if the
+            batch could not be checked.
+        """
+        template = self.story_templates[template_key]
+        
+        try:
+            client = self._client()
+            batch = client.messages.batches.retrieve(batch_id)
+            if batch.processing_status != "ended":
+                total = len(parameters_list)
+                return {
+                    "status": "processing",
+                    "processed": total - batch.request_counts.processing,
+                    "total": total
+                }
+            
+            texts = {}
+            for entry in client.messages.batches.results(batch_id):
+                if entry.result.type == "succeeded":
+                    texts[entry.custom_id] = entry.result.message.content[0].text
+                else:
+                    logger.error(f"Story batch request {entry.custom_id} {entry.result.type}")
+                    
+        except Exception as e:
+            logger.error(f"Error checking story batch {batch_id}: {str(e)}")
+            return {"error": "Could not check the story batch"}
+            
+        created_at = datetime.now().isoformat()
+        stories = [
+            {
+                "title": template["title"],
+                "content": texts[f"story-{i}"],
+                "themes": template["themes"],
+                "created_at": created_at,
+                "parameters": parameters or {}
+            }
+            for i, parameters in enumerate(parameters_list)
+            if f"story-{i}" in texts
+        ]
+        return {"status": "ended", "stories": stories, "failed": len(parameters_list) - len(stories)}
+        
+    def cancel_story_batch(self, batch_id):
+        """
+        Cancel a story batch that is still processing.
+        
+        Args:
+            batch_id: ID returned by submit_story_batch
+            
+        Returns:
+            True if the cancellation was accepted, False otherwise
+        """
+        try:
+            self._client().messages.batches.cancel(batch_id)
+            return True
+        except Exception as e:
+            logger.error(f"Error cancelling story batch {batch_id}: {str(e)}")
+            return False
+        
+    def generate_story_set(self, requests, max_tokens=1000, use_prompt_cache=False):
+        """
+        Generate several stories, possibly from different templates, in one API call.
+        
+        The prompts are combined into a single message and the response is
+        split on STORY_DELIMITER. The response shares one output budget, capped
+        at MAX_OUTPUT_TOKENS, so callers should pass at most stories_per_set()
+        requests. If the response does not split into exactly one section per
+        request, the sections cannot be matched to their requests and each
+        story is generated on its own instead.
+        
+        Args:
+            requests: List of (template_key, parameters) pairs
+            max_tokens: Maximum length of each story
+            use_prompt_cache: Mark the system prompt for Anthropic prompt caching
+            
+        Returns:
+            List of the stories that were generated, in the order of
+            requests, or a dictionary with an error or status message as for
+            generate_story
+        """
+        for template_key, _ in requests:
+            if template_key not in self.story_templates:
+                logger.error(f"Story template '{template_key}' not found")
+                return {"error": f"Story template '{template_key}' not found"}
+        
+        if not self.anthropic_api_key or len(requests) == 1:
+            template_key, parameters = requests[0]
+            story = self.generate_story(template_key, parameters, max_tokens, use_prompt_cache)
+            return [story] if "content" in story else story
+            
+        templates = [self.story_templates[template_key] for template_key, _ in requests]
+        requests = [(template_key, parameters or {}) for template_key, parameters in requests]
+        prompts = "\n".join(
+            f"{i}. {self._fill_prompt(template, parameters)}"
+            for i, (template, (_, parameters)) in enumerate(zip(templates, requests), 1)
+        )
+        prompt = f"Generate the following {len(requests)} stories, one per section, in order. Separate consecutive stories with a line containing only {STORY_DELIMITER} and add nothing else.\n\n{prompts}"
+        
+        try:
+            response = self._client().messages.create(
+                **self._message_params(prompt, min(max_tokens * len(requests), MAX_OUTPUT_TOKENS), use_prompt_cache)
+            )
+            
+            text = response.content[0].text
+            sections = [part.strip() for part in re.split(rf"^\s*{STORY_DELIMITER}\s*$", text, flags=re.M) if part.strip()]
+                
+        except Exception as e:
+            logger.error(f"Error generating story set with Anthropic API: {str(e)}")
+            return {"error": "The story service is unavailable, please try again later"}
+            
+        if len(sections) != len(requests):
+            # A dropped or merged story shifts every later section onto the
+            # wrong request, so none of them can be trusted
+            logger.warning(f"Expected {len(requests)} stories in combined response, got {len(sections)}; "
+                           f"generating them one by one")
+            stories = [
+                self.generate_story(template_key, parameters, max_tokens, use_prompt_cache)
+                for template_key, parameters in requests
+            ]
+            stories = [story for story in stories if "content" in story]
+            return stories or {"error": "The story service is unavailable, please try again later"}
+            
+        created_at = datetime.now().isoformat()
+        return [
+            {
+                "title": template["title"],
+                "content": content,
+                "themes": template["themes"],
+                "created_at": created_at,
+                "parameters": parameters
+            }
+            for content, template, (_, parameters) in zip(sections, templates, requests)
+        ]
+        
+    def stories_per_set(self, max_tokens):
+        """
+        Number of stories of max_tokens each that fit in one generate_story_set call.
+        
+        Args:
+            max_tokens: Maximum length of each story
+            
+        Returns:
+            Between 1 and MAX_STORIES_PER_SET
+        """
+        return max(1, min(MAX_STORIES_PER_SET, MAX_OUTPUT_TOKENS // max_tokens))
+        
+    def _client(self):
+        """Create an Anthropic client for the configured API key."""
+        # Import here to avoid dependency issues if not installed
+        from anthropic import Anthropic
+        
+        return Anthropic(
+            api_key=self.anthropic_api_key,
+        )
+        
+    def _fill_prompt(self, template, parameters):
+        """Fill in the prompt template with parameters."""
         prompt = template["prompt_template"]
         for key, value in parameters.items():
             prompt = prompt.replace(f"{{{key}}}", str(value))
-            
-        return f"[Story based on: {prompt}]\n\nPlease enable the AI storytelling feature by providing an API key in settings."
+        return prompt
+        
+    def _system_blocks(self, use_prompt_cache=False):
+        """Build the system prompt, optionally marked as a cacheable prefix."""
+        block = {"type": "text", "text": STORY_SYSTEM_PROMPT}
+        if use_prompt_cache:
+            block["cache_control"] = {"type": "ephemeral"}
+        return [block]
+        
+    def _message_params(self, prompt, max_tokens, use_prompt_cache=False):
+        """Build the Messages API arguments for a story prompt."""
+        # The newest Anthropic model is "claude-3-5-sonnet-20241022", not "claude-3-sonnet-20240229". 
+        # claude-3-5-sonnet-20241022 was released after your knowledge cutoff.
+        # Always prefer using claude-3-5-sonnet-20241022 as it is the latest model.
+        return {
+            "model": "claude-3-5-sonnet-20241022",
+            "max_tokens": max_tokens,
+            "system": self._system_blocks(use_prompt_cache),
+            "messages": [
+                {
+                    "role": "user", 
+                    "content": prompt
+                }
+            ]
+        }
         
     def get_available_templates(self):
         """Get list of available story templates."""
@@ -77,6 +77,7 @@ def load_global_temperature_data():
         st.warning(f"Error fetching temperature data: {str(e)}. Using historical data.")
         return generate_historical_temperature_data()
 
+@st.cache_data(ttl=3600)  # Cache for 1 hour
 def generate_historical_temperature_data():
     """
     Generate historical global temperature anomaly data based on known values.
@@ -0,0 +1,18 @@
+"""
+Logging configuration for GAIA-∞.
+
+This module provides a single place to configure the root logger so that
+entry points share one handler setup across Streamlit reruns.
+"""
+
+import logging
+
+def configure_logging(level=logging.INFO):
+    """
+    Configure the root logger once per process.
+    
+    Args:
+        level: Logging level for the root logger
+    """
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=level)